@@ -1,4 +1,5 @@
 import ast
+import atexit
 import collections
 from datetime import datetime
 from typing import List
@@ -38,7 +39,6 @@ from schema.schema_constants import TriggerTypeEnum
 # HuBMAP commons
 from hubmap_commons import string_helper
 from hubmap_commons import file_helper as hm_file_helper
-from hubmap_commons import neo4j_driver
 from hubmap_commons.hm_auth import AuthHelper
 from hubmap_commons.exceptions import HTTPException
 
@@ -53,6 +53,7 @@ from atlas_consortia_commons.string import equals
 from atlas_consortia_commons.ubkg.ubkg_sdk import init_ontology
 from atlas_consortia_commons.decorator import require_data_admin, require_json, require_valid_token
 from lib.ontology import Ontology
+from lib import neo4j_helper
 
 # Root logger configuration
 global logger
@@ -133,19 +134,59 @@ except Exception:
 ## Neo4j connection initialization
 ####################################################################################################
 
-# The neo4j_driver (from commons package) is a singleton module
+# The connection pool settings, each uWSGI process runs multiple threads (16)
+# so the pool should hold more connections than there are threads per process
+# Missing settings fall back to the neo4j driver defaults
+neo4j_pool_config = {
+    'max_connection_pool_size': app.config.get('NEO4J_MAX_CONNECTION_POOL_SIZE', 100),
+    'connection_acquisition_timeout': app.config.get('NEO4J_CONNECTION_ACQUISITION_TIMEOUT'),
+    'max_connection_lifetime': app.config.get('NEO4J_MAX_CONNECTION_LIFETIME'),
+    'keep_alive': app.config.get('NEO4J_KEEP_ALIVE')
+}
+
+# The neo4j_helper keeps a single long-lived driver (and connection pool) per uri
 # This neo4j_driver_instance will be used for application-specifc neo4j queries
 # as well as being passed to the schema_manager
 try:
-    neo4j_driver_instance = neo4j_driver.instance(app.config['NEO4J_URI'],
+    neo4j_driver_instance = neo4j_helper.instance(app.config['NEO4J_URI'],
                                                   app.config['NEO4J_USERNAME'],
-                                                  app.config['NEO4J_PASSWORD'])
+                                                  app.config['NEO4J_PASSWORD'],
+                                                  database=app.config.get('NEO4J_DATABASE'),
+                                                  **neo4j_pool_config)
+    # Close the shared driver and its connection pool when the process exits
+    atexit.register(neo4j_helper.close)
     logger.info("Initialized neo4j_driver module successfully :)")
 except Exception:
     msg = "Failed to initialize the neo4j_driver module"
     # Log the full stack trace, prepend a line with our message
     logger.exception(msg)
 
+# Make sure the uuid lookups and property filters are backed by indexes, they are only created when missing
+# Use a short-lived driver so no connection is left in the shared pool before uWSGI forks the workers
+try:
+    with neo4j_helper.create_driver(app.config['NEO4J_URI'],
+                                    app.config['NEO4J_USERNAME'],
+                                    app.config['NEO4J_PASSWORD']) as setup_driver:
+        app_neo4j_queries.create_uuid_constraints(setup_driver)
+        app_neo4j_queries.create_property_indexes(setup_driver)
+    logger.info("Verified the neo4j constraints and indexes successfully :)")
+except Exception:
+    msg = "Failed to create the neo4j constraints and indexes"
+    # Log the full stack trace, prepend a line with our message
+    logger.exception(msg)
+
+# Have the neo4j server plan the hot read queries before the first requests, failures only cost the cold start
+try:
+    with neo4j_helper.create_driver(app.config['NEO4J_URI'],
+                                    app.config['NEO4J_USERNAME'],
+                                    app.config['NEO4J_PASSWORD']) as setup_driver:
+        schema_neo4j_queries.warm_up_query_plans(setup_driver)
+    logger.info("Warmed up the neo4j query plans successfully :)")
+except Exception:
+    msg = "Failed to warm up the neo4j query plans"
+    # Log the full stack trace, prepend a line with our message
+    logger.exception(msg)
+
 
 ####################################################################################################
 ## Memcached client initialization
@@ -184,15 +225,22 @@ if MEMCACHED_MODE:
         MEMCACHED_MODE = False
 
 
+"""
+Close the neo4j sessions reused by the read queries at the end of every request
+"""
+@app.teardown_request
+def close_neo4j_sessions(error):
+    neo4j_helper.close_request_sessions()
+
+
 """
 Close the current neo4j connection at the end of every request
 """
 @app.teardown_appcontext
 def close_neo4j_driver(error):
     if hasattr(g, 'neo4j_driver_instance'):
-        # Close the driver instance
-        neo4j_driver.close()
-        # Also remove neo4j_driver_instance from Flask's application context
+        # The shared driver and its connection pool outlive the request, they are closed at process shutdown
+        # Only remove neo4j_driver_instance from Flask's application context
         g.neo4j_driver_instance = None
 
 
@@ -592,11 +640,6 @@ def get_entity_by_id(id):
         abort_forbidden(f"The requested {normalized_entity_type} has non-public data. "
                         "A Globus token with access permission is required.")
 
-    # Also normalize the result based on schema
-    final_result = schema_manager.normalize_object_result_for_response(provenance_type='ENTITIES',
-                                                                       entity_dict=complete_dict,
-                                                                       properties_to_include=['protocol_url'])
-
     # Result filtering based on query string
     # The `data_access_level` property is available in all entities Source/Sample/Dataset
     # and this filter is being used by gateway to check the data_access_level for file assets
@@ -621,6 +664,12 @@ def get_entity_by_id(id):
         else:
             abort_bad_req("The specified query string is not supported. Use '?property=<key>' to filter the result")
     else:
+        # Only normalize the result based on schema when the whole dict is returned,
+        # the single property filtering above reads the value from complete_dict directly
+        final_result = schema_manager.normalize_object_result_for_response(provenance_type='ENTITIES',
+                                                                           entity_dict=complete_dict,
+                                                                           properties_to_include=['protocol_url'])
+
         # Response with the dict
         if public_entity and not user_in_sennet_read_group(request):
             final_result = schema_manager.exclude_properties_from_response(fields_to_exclude, final_result)
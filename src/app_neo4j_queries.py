@@ -1,9 +1,11 @@
+import functools
 import logging
 
 from atlas_consortia_commons.object import enum_val
 from atlas_consortia_commons.string import equals
 from neo4j.exceptions import TransactionError
 
+from lib import neo4j_helper
 from lib.ontology import Ontology
 from schema import schema_neo4j_queries
 
@@ -12,6 +14,13 @@ logger = logging.getLogger(__name__)
 # The filed name of the single result record
 record_field_name = 'result'
 
+# The node labels that are looked up by uuid and get a uniqueness constraint (and its backing index)
+uuid_constraint_labels = ['Entity', 'Dataset', 'Sample', 'Source', 'Upload', 'Collection', 'Publication', 'Activity']
+# Non-unique properties used as filters, keyed by label
+property_index_keys = {
+    'Sample': ['sample_category']
+}
+
 ####################################################################################################
 ## Directly called by app.py
 ####################################################################################################
@@ -35,9 +44,9 @@ def check_connection(neo4j_driver):
     query = (f"RETURN 1 AS {record_field_name}")
 
     # Sessions will often be created and destroyed using a with block context
-    with neo4j_driver.session() as session:
+    with neo4j_helper.new_session(neo4j_driver) as session:
         # Returned type is a Record object
-        record = session.read_transaction(_execute_readonly_tx, query)
+        record = session.execute_read(_execute_readonly_tx, query)
 
         # When record[record_field_name] is not None (namely the cypher result is not null)
         # and the value equals 1
@@ -50,6 +59,53 @@ def check_connection(neo4j_driver):
     return False
 
 
+"""
+Create the uniqueness constraints on the uuid property of the labels we look up by uuid.
+Each uniqueness constraint is backed by an index, so a `MATCH (e:Entity {uuid: $uuid})`
+becomes an index seek instead of a label scan. Existing constraints are left untouched.
+
+Parameters
+----------
+neo4j_driver : neo4j.Driver object
+    The neo4j database connection pool
+"""
+
+
+def create_uuid_constraints(neo4j_driver):
+    with neo4j_helper.new_session(neo4j_driver) as session:
+        for label in uuid_constraint_labels:
+            query = (f"CREATE CONSTRAINT {label.lower()}_uuid IF NOT EXISTS "
+                     f"FOR (n:{label}) REQUIRE n.uuid IS UNIQUE")
+
+            logger.debug("======create_uuid_constraints() query======\n%s", query)
+
+            # Schema commands can not be mixed with other statements, run each one in its own auto-commit transaction
+            session.run(query).consume()
+
+
+"""
+Create the range indexes on the non-unique properties we filter on, e.g. `Sample.sample_category`,
+so such filters become index seeks instead of per-row property checks. Existing indexes are left untouched.
+
+Parameters
+----------
+neo4j_driver : neo4j.Driver object
+    The neo4j database connection pool
+"""
+
+
+def create_property_indexes(neo4j_driver):
+    with neo4j_helper.new_session(neo4j_driver) as session:
+        for label, keys in property_index_keys.items():
+            for key in keys:
+                query = (f"CREATE INDEX {label.lower()}_{key} IF NOT EXISTS "
+                         f"FOR (n:{label}) ON (n.{key})")
+
+                logger.debug("======create_property_indexes() query======\n%s", query)
+
+                session.run(query).consume()
+
+
 """
 Get the activity connected to the given entity by the relationship WAS_GENERATED_BY
 
@@ -71,14 +127,13 @@ def get_activity_was_generated_by(neo4j_driver, uuid):
     result = {}
 
     query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(a:Activity)"
-             f"WHERE e.uuid = '{uuid}' "
+             f"WHERE e.uuid = $uuid "
              f"RETURN a AS {record_field_name}")
 
-    logger.debug("======get_activity() query======")
-    logger.debug(query)
+    logger.debug("======get_activity_was_generated_by() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             # Convert the neo4j node into Python dict
@@ -108,14 +163,13 @@ def get_activity(neo4j_driver, uuid):
     result = {}
 
     query = (f"MATCH (e:Activity) "
-             f"WHERE e.uuid = '{uuid}' "
+             f"WHERE e.uuid = $uuid "
              f"RETURN e AS {record_field_name}")
 
-    logger.debug("======get_activity() query======")
-    logger.debug(query)
+    logger.debug("======get_activity() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             # Convert the neo4j node into Python dict
@@ -145,14 +199,13 @@ def get_activity_protocol(neo4j_driver, uuid):
     result = {}
 
     query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(a:Activity)"
-             f"WHERE e.uuid = '{uuid}' "
+             f"WHERE e.uuid = $uuid "
              f"RETURN a.protocol_url AS protocol_url")
 
-    logger.debug("======get_activity() query======")
-    logger.debug(query)
+    logger.debug("======get_activity_protocol() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record is not None:
             if record[0] is not None:
@@ -183,14 +236,13 @@ def get_entity(neo4j_driver, uuid):
     result = {}
 
     query = (f"MATCH (e:Entity) "
-             f"WHERE e.uuid = '{uuid}' "
+             f"WHERE e.uuid = $uuid "
              f"RETURN e AS {record_field_name}")
 
-    logger.info("======get_entity() query======")
-    logger.info(query)
+    logger.debug("======get_entity() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             # Convert the neo4j node into Python dict
@@ -223,16 +275,14 @@ def get_entity_by_id(neo4j_driver, uuid, property_keys=None):
     """
     return_statement = 'e'
     if property_keys is not None:
-        joined_props = ', '.join([f'{key}: e.{key}' for key in property_keys])
-        return_statement = f'{{ {joined_props} }}'
+        return_statement = _property_keys_projection('e')
 
     query = f"MATCH (e:Entity) WHERE e.uuid=$uuid RETURN {return_statement} AS {record_field_name}"
 
-    logger.info("======get_entity_by_id() query======")
-    logger.info(query)
+    logger.debug("======get_entity_by_id() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query, uuid=uuid)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid, property_keys=property_keys)
 
         if record and record[record_field_name]:
             return dict(record[record_field_name])
@@ -265,19 +315,16 @@ def get_entities_by_type(neo4j_driver, entity_type, property_key=None):
     if property_key:
         query = (f"MATCH (e:{entity_type}) "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(e.{property_key})) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT e.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:{entity_type}) "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(e)) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT e) AS {record_field_name}")
 
-    logger.info("======get_entities_by_type() query======")
-    logger.info(query)
+    logger.debug("======get_entities_by_type() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query)
 
         if record and record[record_field_name]:
             if property_key:
@@ -322,23 +369,22 @@ def get_entities_for_dashboard(neo4j_driver, entity_uuids, entity_type):
 
     if entity_type.upper() == Ontology.ops().entities().SAMPLE.upper():
         query = (f"Match (e:Sample) "
-                 f"WHERE e.uuid in {entity_uuids} "
+                 f"WHERE e.uuid IN $entity_uuids "
                  f"OPTIONAL MATCH (e:Sample)-[*]->(o:Sample {{sample_category: 'Organ'}}) "
-                 f"return apoc.coll.toSet(COLLECT({{sennet_id: e.sennet_id, uuid: e.uuid, "
+                 f"return COLLECT(DISTINCT {{sennet_id: e.sennet_id, uuid: e.uuid, "
                  f"lab_tissue_sample_id: e.lab_tissue_sample_id, sample_category: e.sample_category,"
-                 f"organ_type: COALESCE(o.organ, e.organ), group_name: e.group_name}})) as {record_field_name}")
+                 f"organ_type: COALESCE(o.organ, e.organ), group_name: e.group_name}}) as {record_field_name}")
 
     if entity_type.upper() == Ontology.ops().entities().SOURCE.upper():
         query = (f"Match (e:Source) "
-                 f"WHERE e.uuid in {entity_uuids} "
-                 f"return apoc.coll.toSet(COLLECT({{sennet_id: e.sennet_id, uuid: e.uuid, "
-                 f"lab_source_id: e.lab_source_id, source_type: e.source_type, group_name: e.group_name}})) as {record_field_name}")
+                 f"WHERE e.uuid IN $entity_uuids "
+                 f"return COLLECT(DISTINCT {{sennet_id: e.sennet_id, uuid: e.uuid, "
+                 f"lab_source_id: e.lab_source_id, source_type: e.source_type, group_name: e.group_name}}) as {record_field_name}")
 
-    logger.info("======get_entities_for_dashboard() query======")
-    logger.info(query)
+    logger.debug("======get_entities_for_dashboard() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, entity_uuids=list(entity_uuids))
         if record and record[record_field_name]:
             results = record[record_field_name]
 
@@ -363,7 +409,7 @@ def dataset_has_component_children(neo4j_driver, dataset_uuid):
     query = ("MATCH p=(ds1:Dataset)-[:WAS_GENERATED_BY]->(a:Activity)-[:USED]->(ds2:Dataset) "
              "WHERE ds2.uuid = $dataset_uuid AND a.creation_action = 'Multi-Assay Split' "
              "RETURN (COUNT(p) > 0)")
-    with neo4j_driver.session() as session:
+    with neo4j_helper.session(neo4j_driver) as session:
         value = session.run(query, dataset_uuid=dataset_uuid).value()
     return value[0]
 
@@ -388,16 +434,14 @@ list
 def get_ancestor_organs(neo4j_driver, entity_uuid):
     results = []
 
-    query = (f"MATCH (e:Entity {{uuid:'{entity_uuid}'}})-[*]->(organ:Sample {{sample_category:'{Ontology.ops().specimen_categories().ORGAN}'}}) "
+    query = (f"MATCH (e:Entity {{uuid:$entity_uuid}})-[*]->(organ:Sample {{sample_category:'{Ontology.ops().specimen_categories().ORGAN}'}}) "
              # COLLECT() returns a list
-             # apoc.coll.toSet() reruns a set containing unique nodes
-             f"RETURN apoc.coll.toSet(COLLECT(organ)) AS {record_field_name}")
+             f"RETURN COLLECT(DISTINCT organ) AS {record_field_name}")
 
-    logger.info("======get_ancestor_organs() query======")
-    logger.info(query)
+    logger.debug("======get_ancestor_organs() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, entity_uuid=entity_uuid)
 
         if record and record[record_field_name]:
             results = _nodes_to_dicts(record[record_field_name])
@@ -433,23 +477,22 @@ def create_entity(neo4j_driver, entity_type, entity_data_dict, superclass=None):
     if superclass is not None:
         labels = f':Entity:{entity_type}:{superclass}'
 
-    node_properties_map = _build_properties_map(entity_data_dict)
+    node_properties_map, parameterized_data = schema_neo4j_queries.build_parameterized_map(entity_data_dict)
 
     query = (
         f"CREATE (e{labels}) "
         f"SET e = {node_properties_map} "
         f"RETURN e AS {record_field_name}")
 
-    logger.info("======create_entity() query======")
-    logger.info(query)
+    logger.debug("======create_entity() query======\n%s", query)
 
     try:
-        with neo4j_driver.session() as session:
+        with neo4j_helper.new_session(neo4j_driver) as session:
             entity_dict = {}
 
             tx = session.begin_transaction()
 
-            result = tx.run(query)
+            result = tx.run(query, parameterized_data)
             record = result.single()
             entity_node = record[record_field_name]
 
@@ -492,7 +535,7 @@ direct_ancestor_uuid : str
 
 def create_multiple_samples(neo4j_driver, samples_dict_list, activity_data_dict, direct_ancestor_uuid):
     try:
-        with neo4j_driver.session() as session:
+        with neo4j_helper.new_session(neo4j_driver) as session:
             tx = session.begin_transaction()
 
             activity_uuid = activity_data_dict['uuid']
@@ -501,22 +544,21 @@ def create_multiple_samples(neo4j_driver, samples_dict_list, activity_data_dict,
             _create_activity_tx(tx, activity_data_dict)
 
             # Step 2: create relationship from source entity node to this Activity node
-            _create_relationship_tx(tx, direct_ancestor_uuid, activity_uuid, 'USED', '<-')
+            _create_relationship_tx(tx, direct_ancestor_uuid, activity_uuid, 'USED', '<-', target_label='Activity')
 
             # Step 3: create each new sample node and link to the Activity node at the same time
             for sample_dict in samples_dict_list:
-                node_properties_map = _build_properties_map(sample_dict)
+                node_properties_map, parameterized_data = schema_neo4j_queries.build_parameterized_map(sample_dict)
 
                 query = (f"MATCH (a:Activity) "
-                         f"WHERE a.uuid = '{activity_uuid}' "
+                         f"WHERE a.uuid = $activity_uuid "
                          # Always define the Entity label in addition to the target `entity_type` label
                          f"CREATE (e:Entity:Sample {node_properties_map} ) "
                          f"CREATE (e)-[:WAS_GENERATED_BY]->(a)")
 
-                logger.info("======create_multiple_samples() individual query======")
-                logger.info(query)
+                logger.debug("======create_multiple_samples() individual query======\n%s", query)
 
-                tx.run(query)
+                tx.run(query, parameterized_data, activity_uuid=activity_uuid)
 
             # Then
             tx.commit()
@@ -555,28 +597,28 @@ dict
 
 
 def update_entity(neo4j_driver, entity_type, entity_data_dict, uuid):
-    node_properties_map = _build_properties_map(entity_data_dict)
+    node_properties_map, parameterized_data = schema_neo4j_queries.build_parameterized_map(entity_data_dict)
+
+    # The property parameters are prefixed with p_, so a `uuid` key in the data keeps its own parameter
+    parameterized_data['uuid'] = uuid
 
-    query = (f"MATCH (e:{entity_type}) "
-             f"WHERE e.uuid = '{uuid}' "
+    query = (f"MATCH (e:{entity_type} {{uuid: $uuid}}) "
              f"SET e += {node_properties_map} "
              f"RETURN e AS {record_field_name}")
 
-    logger.info("======update_entity() query======")
-    logger.info(query)
+    logger.debug("======update_entity() query======\n%s", query)
+
+    # Run as a managed write transaction so the driver retries it on transient errors
+    def _update_tx(tx):
+        return tx.run(query, parameterized_data).single()
 
     try:
-        with neo4j_driver.session() as session:
+        with neo4j_helper.new_session(neo4j_driver) as session:
             entity_dict = {}
 
-            tx = session.begin_transaction()
-
-            result = tx.run(query)
-            record = result.single()
+            record = session.execute_write(_update_tx)
             entity_node = record[record_field_name]
 
-            tx.commit()
-
             entity_dict = _node_to_dict(entity_node)
 
             # logger.info("======update_entity() resulting entity_dict======")
@@ -588,11 +630,6 @@ def update_entity(neo4j_driver, entity_type, entity_data_dict, uuid):
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() is False:
-            logger.info("Failed to commit update_entity() transaction, rollback")
-
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -619,28 +656,25 @@ def get_ancestors(neo4j_driver, uuid, data_access_level=None, property_key=None)
 
     predicate = ''
     if data_access_level:
-        predicate = f"AND ancestor.data_access_level = '{data_access_level}' "
+        predicate = "AND ancestor.data_access_level = $data_access_level "
 
     if property_key:
         query = (f"MATCH (e:Entity)-[:USED|WAS_GENERATED_BY*]->(ancestor:Entity) "
                  # Filter out the Lab entities
-                 f"WHERE e.uuid='{uuid}' AND ancestor.entity_type <> 'Lab' {predicate}"
+                 f"WHERE e.uuid=$uuid AND ancestor.entity_type <> 'Lab' {predicate}"
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(ancestor.{property_key})) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT ancestor.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)-[:USED|WAS_GENERATED_BY*]->(ancestor:Entity) "
                  # Filter out the Lab entities
-                 f"WHERE e.uuid='{uuid}' AND ancestor.entity_type <> 'Lab' {predicate}"
+                 f"WHERE e.uuid=$uuid AND ancestor.entity_type <> 'Lab' {predicate}"
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(ancestor)) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT ancestor) AS {record_field_name}")
 
-    logger.info("======get_ancestors() query======")
-    logger.info(query)
+    logger.debug("======get_ancestors() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid, data_access_level=data_access_level)
 
         if record and record[record_field_name]:
             if property_key:
@@ -681,28 +715,25 @@ def get_descendants(neo4j_driver, uuid, data_access_level=None, property_key=Non
 
     predicate = ''
     if data_access_level:
-        predicate = f"AND descendant.data_access_level = '{data_access_level}' "
+        predicate = "AND descendant.data_access_level = $data_access_level "
 
     if property_key:
         query = (f"MATCH (e:Entity)<-[:USED|WAS_GENERATED_BY*]-(descendant:Entity) "
                  # The target entity can't be a Lab
                  f"WHERE e.uuid=$uuid AND e.entity_type <> 'Lab' {predicate}"
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(descendant.{property_key})) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT descendant.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)<-[:USED|WAS_GENERATED_BY*]-(descendant:Entity) "
                  # The target entity can't be a Lab
                  f"WHERE e.uuid=$uuid AND e.entity_type <> 'Lab' {predicate}"
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(descendant)) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT descendant) AS {record_field_name}")
 
-    logger.info("======get_descendants() query======")
-    logger.info(query)
+    logger.debug("======get_descendants() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query, uuid=uuid)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid, data_access_level=data_access_level)
 
         if record and record[record_field_name]:
             if property_key:
@@ -754,21 +785,18 @@ def get_descendant_datasets(neo4j_driver, uuid, property_key=None):
                  # The target entity can't be a Lab
                  f"WHERE e.uuid=$uuid AND e.entity_type <> 'Lab' "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(descendant.{property_key})) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT descendant.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)<-[:USED|WAS_GENERATED_BY*]-(descendant:Dataset) "
                  # The target entity can't be a Lab
                  f"WHERE e.uuid=$uuid AND e.entity_type <> 'Lab' "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(descendant)) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT descendant) AS {record_field_name}")
 
-    logger.info("======get_descendant_datasets() query======")
-    logger.info(query)
+    logger.debug("======get_descendant_datasets() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query, uuid=uuid)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -808,23 +836,22 @@ def get_ancestors_by_type(neo4j_driver, uuid, ancestor_type, property_keys=None)
         The list of ancestor entities as a dictionary
     """
     if ancestor_type in Ontology.ops(as_arr=True, cb=enum_val).entities():
-        predicate = f"a.entity_type='{ancestor_type}'"
+        predicate = "a.entity_type=$ancestor_type"
     elif ancestor_type in Ontology.ops(as_arr=True, cb=enum_val).specimen_categories():
-        predicate = f"a.sample_category='{ancestor_type}'"
+        predicate = "a.sample_category=$ancestor_type"
     else:
         raise ValueError(f'Unsupported entity type: {ancestor_type}')
 
     return_statement = 'COLLECT(a)'
     if property_keys is not None:
-        joined_props = ', '.join([f'{key}: a.{key}' for key in property_keys])
-        return_statement = f'COLLECT({{ {joined_props} }})'
+        return_statement = f"COLLECT({_property_keys_projection('a')})"
 
     query = ("MATCH (e:Entity)-[:USED|WAS_GENERATED_BY*]->(a:Entity) "
              f"WHERE e.uuid=$uuid AND {predicate} "
              f"RETURN {return_statement} AS {record_field_name}")
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query, uuid=uuid)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid, property_keys=property_keys, ancestor_type=ancestor_type)
 
         if record and record[record_field_name]:
             return list(record[record_field_name])
@@ -854,23 +881,22 @@ def get_descendants_by_type(neo4j_driver, uuid, descendant_type, property_keys=N
         The list of descendant entities as a dictionary
     """
     if descendant_type in Ontology.ops(as_arr=True, cb=enum_val).entities():
-        predicate = f"AND d.entity_type='{descendant_type}'"
+        predicate = "AND d.entity_type=$descendant_type"
     elif descendant_type in Ontology.ops(as_arr=True, cb=enum_val).specimen_categories():
-        predicate = f"AND d.sample_category='{descendant_type}'"
+        predicate = "AND d.sample_category=$descendant_type"
     else:
         raise ValueError(f'Unsupported entity type: {descendant_type}')
 
     return_statement = 'COLLECT(d)'
     if property_keys is not None:
-        joined_props = ', '.join([f'{key}: d.{key}' for key in property_keys])
-        return_statement = f'COLLECT({{ {joined_props} }})'
+        return_statement = f"COLLECT({_property_keys_projection('d')})"
 
     query = ("MATCH (e:Entity)<-[:USED|WAS_GENERATED_BY*]-(d:Entity) "
              f"WHERE e.uuid=$uuid {predicate} "
              f"RETURN {return_statement} AS {record_field_name}")
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query, uuid=uuid)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid, property_keys=property_keys, descendant_type=descendant_type)
 
         if record and record[record_field_name]:
             return list(record[record_field_name])
@@ -897,15 +923,14 @@ def get_source_samples(neo4j_driver, uuid, property_keys=None):
     """
     return_statement = 'COLLECT(s)'
     if property_keys is not None:
-        joined_props = ', '.join([f'{key}: s.{key}' for key in property_keys])
-        return_statement = f'COLLECT({{ {joined_props} }})'
+        return_statement = f"COLLECT({_property_keys_projection('s')})"
 
     query = (f"MATCH (d:Dataset)-[:WAS_GENERATED_BY|USED*]->(s:Sample) "
-             f"WHERE d.uuid='{uuid}' "
+             f"WHERE d.uuid=$uuid "
              f"RETURN {return_statement} AS {record_field_name}")
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query, uuid=uuid)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid, property_keys=property_keys)
 
         if record and record[record_field_name]:
             return list(record[record_field_name])
@@ -938,23 +963,20 @@ def get_parents(neo4j_driver, uuid, property_key=None):
     if property_key:
         query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent:Entity) "
                  # Filter out the Lab entities
-                 f"WHERE e.uuid='{uuid}' AND parent.entity_type <> 'Lab' "
+                 f"WHERE e.uuid=$uuid AND parent.entity_type <> 'Lab' "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(parent.{property_key})) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT parent.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent:Entity) "
                  # Filter out the Lab entities
-                 f"WHERE e.uuid='{uuid}' AND parent.entity_type <> 'Lab' "
+                 f"WHERE e.uuid=$uuid AND parent.entity_type <> 'Lab' "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(parent)) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT parent) AS {record_field_name}")
 
-    logger.info("======get_parents() query======")
-    logger.info(query)
+    logger.debug("======get_parents() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -992,23 +1014,20 @@ def get_children(neo4j_driver, uuid, property_key=None):
     if property_key:
         query = (f"MATCH (e:Entity)<-[:USED]-(:Activity)<-[:WAS_GENERATED_BY]-(child:Entity) "
                  # The target entity can't be a Lab
-                 f"WHERE e.uuid='{uuid}' AND e.entity_type <> 'Lab' "
+                 f"WHERE e.uuid=$uuid AND e.entity_type <> 'Lab' "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(child.{property_key})) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT child.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)<-[:USED]-(:Activity)<-[:WAS_GENERATED_BY]-(child:Entity) "
                  # The target entity can't be a Lab
-                 f"WHERE e.uuid='{uuid}' AND e.entity_type <> 'Lab' "
+                 f"WHERE e.uuid=$uuid AND e.entity_type <> 'Lab' "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(child)) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT child) AS {record_field_name}")
 
-    logger.info("======get_children() query======")
-    logger.info(query)
+    logger.debug("======get_children() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -1043,15 +1062,14 @@ def get_source_organ_count(neo4j_driver, uuid: str, organ: str, case_uuid: str =
     """
     match_case = ''
     if case_uuid is not None:
-        match_case = f"AND s.uuid <> '{case_uuid}' "
+        match_case = "AND s.uuid <> $case_uuid "
 
-    query = f"MATCH (s:Sample)-[:WAS_GENERATED_BY]->(a)-[:USED]->(sr:Source) where sr.uuid='{uuid}' " \
-            f"and s.organ='{organ}' {match_case}return count(s) AS {record_field_name}"
+    query = f"MATCH (s:Sample)-[:WAS_GENERATED_BY]->(a)-[:USED]->(sr:Source) where sr.uuid=$uuid " \
+            f"and s.organ=$organ {match_case}return count(s) AS {record_field_name}"
 
-    logger.info("======get_source_organ_count() query======")
-    logger.info(query)
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    logger.debug("======get_source_organ_count() query======\n%s", query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid, organ=organ, case_uuid=case_uuid)
 
         if record and record[record_field_name]:
             return record[record_field_name]
@@ -1080,19 +1098,17 @@ def get_sorted_revisions(neo4j_driver, uuid):
     results = []
 
     query = (f"MATCH (prev:Dataset)<-[:REVISION_OF *0..]-(e:Dataset)<-[:REVISION_OF *0..]-(next:Dataset) "
-             f"WHERE e.uuid='{uuid}' "
-             # COLLECT() returns a list
-             # apoc.coll.toSet() reruns a set containing unique nodes
-             f"WITH apoc.coll.toSet(COLLECT(next) + COLLECT(e) + COLLECT(prev)) AS collection "
+             f"WHERE e.uuid=$uuid "
+             # COLLECT() returns a list, the nodes are deduplicated after the UNWIND
+             f"WITH COLLECT(next) + COLLECT(e) + COLLECT(prev) AS collection "
              f"UNWIND collection as node "
-             f"WITH node ORDER BY node.created_timestamp DESC "
+             f"WITH DISTINCT node ORDER BY node.created_timestamp DESC "
              f"RETURN COLLECT(node) AS {record_field_name}")
 
-    logger.info("======get_sorted_revisions() query======")
-    logger.info(query)
+    logger.debug("======get_sorted_revisions() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             # Convert the list of nodes to a list of dicts
@@ -1131,18 +1147,17 @@ def get_sorted_multi_revisions(neo4j_driver, uuid, fetch_all=True, property_key=
         "MATCH (e:Dataset), (next:Dataset), (prev:Dataset),"
         f"p = (e)-[:REVISION_OF *0..]->(prev),"
         f"n = (e)<-[:REVISION_OF *0..]-(next) "
-        f"WHERE e.uuid='{uuid}' {match_case}"
+        f"WHERE e.uuid=$uuid {match_case}"
         "WITH length(p) AS p_len, prev, length(n) AS n_len, next "
         "ORDER BY prev.created_timestamp, next.created_timestamp DESC "
         f"WITH p_len, collect(distinct prev{collect_prop}) AS prev_revisions, n_len, collect(distinct next{collect_prop}) AS next_revisions "
         f"RETURN [collect(distinct next_revisions), collect(distinct prev_revisions)] AS {record_field_name}"
     )
 
-    logger.info("======get_sorted_revisions() query======")
-    logger.info(query)
+    logger.debug("======get_sorted_revisions() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name] and len(record[record_field_name]) > 0:
             record[record_field_name][0].pop()  # the target will appear twice, pop it from the next list
@@ -1174,14 +1189,13 @@ dataset_uuid : string
     the uuid of the desired dataset
 """
 def get_all_dataset_samples(neo4j_driver, dataset_uuid):
-    query = f"MATCH p = (ds:Dataset {{uuid: '{dataset_uuid}'}})-[*]->(s:Source) return p"
-    logger.info("======get_all_dataset_samples() query======")
-    logger.info(query)
+    query = f"MATCH p = (ds:Dataset {{uuid: $dataset_uuid}})-[*]->(s:Source) return p"
+    logger.debug("======get_all_dataset_samples() query======\n%s", query)
 
     # Dictionary of Dictionaries, keyed by UUID, containing each Sample returned in the Neo4j Path
     dataset_sample_list = {}
-    with neo4j_driver.session() as session:
-        result = session.run(query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        result = session.run(query, dataset_uuid=dataset_uuid)
         if result.peek() is None:
             return
         for record in result:
@@ -1217,15 +1231,14 @@ def get_previous_multi_revisions(neo4j_driver, uuid, property_key=None):
 
     collect_prop = f".{property_key}" if property_key else ''
     query = (f"MATCH p=(e:Entity)-[:REVISION_OF*]->(prev:Entity) "
-             f"WHERE e.uuid='{uuid}' "
+             f"WHERE e.uuid=$uuid "
              f"WITH length(p) as p_len, collect(distinct prev{collect_prop}) as prev_revisions "
              f"RETURN collect(distinct prev_revisions) AS {record_field_name}")
 
-    logger.info("======get_previous_multi_revisions() query======")
-    logger.info(query)
+    logger.debug("======get_previous_multi_revisions() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -1263,15 +1276,14 @@ def get_next_multi_revisions(neo4j_driver, uuid, property_key=None):
 
     collect_prop = f".{property_key}" if property_key else ''
     query = (f"MATCH n=(e:Entity)<-[:REVISION_OF*]-(next:Entity) "
-             f"WHERE e.uuid='{uuid}' "
+             f"WHERE e.uuid=$uuid "
              f"WITH length(n) as n_len, collect(distinct next{collect_prop}) as next_revisions "
              f"RETURN collect(distinct next_revisions) AS {record_field_name}")
 
-    logger.info("======get_next_multi_revisions() query======")
-    logger.info(query)
+    logger.debug("======get_next_multi_revisions() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -1309,22 +1321,19 @@ def get_previous_revisions(neo4j_driver, uuid, property_key=None):
 
     if property_key:
         query = (f"MATCH (e:Entity)-[:REVISION_OF*]->(prev:Entity) "
-                 f"WHERE e.uuid='{uuid}' "
+                 f"WHERE e.uuid=$uuid "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(prev.{property_key})) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT prev.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)-[:REVISION_OF*]->(prev:Entity) "
-                 f"WHERE e.uuid='{uuid}' "
+                 f"WHERE e.uuid=$uuid "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(prev)) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT prev) AS {record_field_name}")
 
-    logger.info("======get_previous_revisions() query======")
-    logger.info(query)
+    logger.debug("======get_previous_revisions() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -1361,22 +1370,19 @@ def get_next_revisions(neo4j_driver, uuid, property_key=None):
 
     if property_key:
         query = (f"MATCH (e:Entity)<-[:REVISION_OF*]-(next:Entity) "
-                 f"WHERE e.uuid='{uuid}' "
+                 f"WHERE e.uuid=$uuid "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(next.{property_key})) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT next.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)<-[:REVISION_OF*]-(next:Entity) "
-                 f"WHERE e.uuid='{uuid}' "
+                 f"WHERE e.uuid=$uuid "
                  # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(next)) AS {record_field_name}")
+                 f"RETURN COLLECT(DISTINCT next) AS {record_field_name}")
 
-    logger.info("======get_next_revisions() query======")
-    logger.info(query)
+    logger.debug("======get_next_revisions() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -1404,39 +1410,29 @@ entitiy_uuids_list : list
 
 
 def add_entities_to_collection(neo4j_driver, collection_uuid, entitiy_uuids_list):
-    # Join the list of uuids and wrap each string in single quote
-    joined_str = ', '.join("'{0}'".format(dataset_uuid) for dataset_uuid in entitiy_uuids_list)
-    # Format a string to be used in Cypher query.
-    # E.g., ['fb6757b606ac35be7fa85062fde9c2e1', 'ku0gd44535be7fa85062fde98gt5']
-    entitiy_uuids_list = '[' + joined_str + ']'
-
-    try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
+    logger.info("Create relationships between the target Collection and the given Entities")
 
-            logger.info("Create relationships between the target Collection and the given Entities")
+    # The uuids are passed as parameters instead of building a quoted list string for the query
+    query = ("MATCH (c:Collection {uuid: $collection_uuid}), (e:Entity) "
+             "WHERE e.uuid IN $entity_uuids "
+             # Use MERGE instead of CREATE to avoid creating the relationship multiple times
+             # MERGE creates the relationship only if there is no existing relationship
+             "MERGE (c)<-[r:IN_COLLECTION]-(e)")
 
-            query = (f"MATCH (c:Collection), (e:Entity) "
-                     f"WHERE c.uuid = '{collection_uuid}' AND e.uuid IN {entitiy_uuids_list} "
-                     # Use MERGE instead of CREATE to avoid creating the relationship multiple times
-                     # MERGE creates the relationship only if there is no existing relationship
-                     f"MERGE (c)<-[r:IN_COLLECTION]-(e)")
+    logger.debug("======add_entities_to_collection() query======\n%s", query)
 
-            logger.info("======add_entities_to_collection() query======")
-            logger.info(query)
+    # Run as a managed write transaction so the driver retries it on transient errors
+    def _add_tx(tx):
+        tx.run(query, collection_uuid=collection_uuid, entity_uuids=list(entitiy_uuids_list)).consume()
 
-            tx.run(query)
-            tx.commit()
+    try:
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            session.execute_write(_add_tx)
     except TransactionError as te:
         msg = f"TransactionError from calling add_entities_to_collection(): {te.value}"
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() is False:
-            logger.info("Failed to commit add_entities_to_collection() transaction, rollback")
-
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -1466,11 +1462,11 @@ def get_provenance(neo4j_driver, uuid, depth, return_descendants=None, query_fil
 
     label_filter = ''
     if query_filter is not None and len(query_filter) > 0:
-        label_filter = f", labelFilter:'{query_filter}'"
+        label_filter = ", labelFilter: $query_filter"
 
     # More info on apoc.path.subgraphAll() procedure: https://neo4j.com/labs/apoc/4.0/graph-querying/expand-subgraph/
     query = (f"MATCH (n:Entity) "
-             f"WHERE n.uuid = '{uuid}' "
+             f"WHERE n.uuid = $uuid "
              f"CALL apoc.path.subgraphAll(n, {{ {max_level_str} relationshipFilter:'{relationship_filter}' {label_filter} }}) "
              f"YIELD nodes, relationships "
              f"WITH [node in nodes | node {{ .*, label:labels(node)[0] }} ] as nodes, "
@@ -1478,11 +1474,10 @@ def get_provenance(neo4j_driver, uuid, depth, return_descendants=None, query_fil
              f"WITH {{ nodes:nodes, relationships:rels }} as json "
              f"RETURN json")
 
-    logger.info("======get_provenance() query======")
-    logger.info(query)
+    logger.debug("======get_provenance() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        return session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        return session.execute_read(_execute_readonly_tx, query, uuid=uuid, query_filter=query_filter)
 
 
 """
@@ -1507,20 +1502,19 @@ def get_dataset_latest_revision(neo4j_driver, uuid, public=False):
         # Don't use [r:REVISION_OF] because
         # Binding a variable length relationship pattern to a variable ('r') is deprecated
         query = (f"MATCH (e:Dataset)<-[:REVISION_OF*]-(next:Dataset) "
-                 f"WHERE e.uuid='{uuid}' AND next.status='Published' "
+                 f"WHERE e.uuid=$uuid AND next.status='Published' "
                  f"WITH LAST(COLLECT(next)) as latest "
                  f"RETURN latest AS {record_field_name}")
     else:
         query = (f"MATCH (e:Dataset)<-[:REVISION_OF*]-(next:Dataset) "
-                 f"WHERE e.uuid='{uuid}' "
+                 f"WHERE e.uuid=$uuid "
                  f"WITH LAST(COLLECT(next)) as latest "
                  f"RETURN latest AS {record_field_name}")
 
-    logger.info("======get_dataset_latest_revision() query======")
-    logger.info(query)
+    logger.debug("======get_dataset_latest_revision() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         # Only convert when record[record_field_name] is not None (namely the cypher result is not null)
         if record and record[record_field_name]:
@@ -1548,14 +1542,13 @@ def get_dataset_revision_number(neo4j_driver, uuid):
     # Don't use [r:REVISION_OF] because
     # Binding a variable length relationship pattern to a variable ('r') is deprecated
     query = (f"MATCH (e:Dataset)-[:REVISION_OF*]->(prev:Dataset) "
-             f"WHERE e.uuid='{uuid}' "
+             f"WHERE e.uuid=$uuid "
              f"RETURN COUNT(prev) AS {record_field_name}")
 
-    logger.info("======get_dataset_revision_number() query======")
-    logger.info(query)
+    logger.debug("======get_dataset_revision_number() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             # The revision number is the count of previous revisions plus 1
@@ -1579,14 +1572,13 @@ uuid : str
 def get_associated_organs_from_dataset(neo4j_driver, dataset_uuid):
     results = []
     query = (f"MATCH (ds:Dataset)-[*]->(organ:Sample {{sample_category:'{Ontology.ops().specimen_categories().ORGAN}'}}) "
-             f"WHERE ds.uuid='{dataset_uuid}'"
-             f"RETURN apoc.coll.toSet(COLLECT(organ)) AS {record_field_name}")
+             f"WHERE ds.uuid=$dataset_uuid "
+             f"RETURN COLLECT(DISTINCT organ) AS {record_field_name}")
 
-    logger.info("======get_associated_organs_from_dataset() query======")
-    logger.info(query)
+    logger.debug("======get_associated_organs_from_dataset() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(_execute_readonly_tx, query, dataset_uuid=dataset_uuid)
 
         if record and record[record_field_name]:
             results = _nodes_to_dicts(record[record_field_name])
@@ -1612,14 +1604,13 @@ def get_associated_samples_from_dataset(neo4j_driver, dataset_uuid):
 
     # specimen_type -> sample_category 12/15/2022
     query = (f"MATCH (ds:Dataset)-[*]->(sample:Sample) "
-             f"WHERE ds.uuid='{dataset_uuid}' AND NOT sample.sample_category = 'organ' "
-             f"RETURN apoc.coll.toSet(COLLECT(sample)) AS {record_field_name}")
+             f"WHERE ds.uuid=$dataset_uuid AND NOT sample.sample_category = 'organ' "
+             f"RETURN COLLECT(DISTINCT sample) AS {record_field_name}")
 
-    logger.info("======get_associated_samples_from_dataset() query======")
-    logger.info(query)
+    logger.debug("======get_associated_samples_from_dataset() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(schema_neo4j_queries.execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(schema_neo4j_queries.execute_readonly_tx, query, dataset_uuid=dataset_uuid)
 
         if record and record[record_field_name]:
             results = schema_neo4j_queries.nodes_to_dicts(record[record_field_name])
@@ -1645,14 +1636,13 @@ def get_associated_sources_from_dataset(neo4j_driver, dataset_uuid):
 
     # specimen_type -> sample_category 12/15/2022
     query = (f"MATCH (ds:Dataset)-[*]->(source:Source) "
-             f"WHERE ds.uuid='{dataset_uuid}'"
-             f"RETURN apoc.coll.toSet(COLLECT(source)) AS {record_field_name}")
+             f"WHERE ds.uuid=$dataset_uuid "
+             f"RETURN COLLECT(DISTINCT source) AS {record_field_name}")
 
-    logger.info("======get_associated_sources_from_dataset() query======")
-    logger.info(query)
+    logger.debug("======get_associated_sources_from_dataset() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(schema_neo4j_queries.execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(schema_neo4j_queries.execute_readonly_tx, query, dataset_uuid=dataset_uuid)
 
         if record and record[record_field_name]:
             results = schema_neo4j_queries.nodes_to_dicts(record[record_field_name])
@@ -1687,19 +1677,24 @@ def get_prov_info(neo4j_driver, param_dict, published_only):
     rui_info_where_clause = "WHERE NOT ruiSample.rui_location IS NULL AND NOT trim(ruiSample.rui_location) = '' "
     dataset_status_query_string = ''
     published_only_query_string = ''
+    # The filter values are bound as parameters so the query text only varies with the filters used
+    parameters = {}
     if 'group_uuid' in param_dict:
-        group_uuid_query_string = f" AND toUpper(ds.group_uuid) = '{param_dict['group_uuid'].upper()}'"
+        group_uuid_query_string = " AND toUpper(ds.group_uuid) = $group_uuid"
+        parameters['group_uuid'] = param_dict['group_uuid'].upper()
     if Ontology.ops().specimen_categories().ORGAN in param_dict:
         organ_query_string = 'MATCH'
         # organ_where_clause = f", organ: '{param_dict['organ'].upper()}'"
-        organ_where_clause = f" WHERE toUpper(organ.organ) = '{param_dict[Ontology.ops().specimen_categories().ORGAN].upper()}'"
+        organ_where_clause = " WHERE toUpper(organ.organ) = $organ"
+        parameters['organ'] = param_dict[Ontology.ops().specimen_categories().ORGAN].upper()
     if 'has_rui_info' in param_dict:
         rui_info_query_string = 'MATCH (ds)-[*]->(ruiSample:Sample)'
         if param_dict['has_rui_info'].lower() == 'false':
             rui_info_query_string = 'MATCH (ds:Dataset)'
             rui_info_where_clause = "WHERE NOT EXISTS {MATCH (ds)-[*]->(ruiSample:Sample) WHERE NOT ruiSample.rui_location IS NULL AND NOT TRIM(ruiSample.rui_location) = ''} MATCH (ds)-[*]->(ruiSample:Sample)"
     if 'dataset_status' in param_dict:
-        dataset_status_query_string = f" AND toUpper(ds.status) = '{param_dict['dataset_status'].upper()}'"
+        dataset_status_query_string = " AND toUpper(ds.status) = $dataset_status"
+        parameters['dataset_status'] = param_dict['dataset_status'].upper()
     if published_only:
         published_only_query_string = " AND toUpper(ds.status) = 'PUBLISHED'"
     query = (f"MATCH (ds:Dataset)-[:WAS_GENERATED_BY]->(a)-[:USED]->(firstSample:Sample)-[*]->(source:Source)"
@@ -1727,12 +1722,11 @@ def get_prov_info(neo4j_driver, param_dict, published_only):
              f" ds.group_uuid, ds.created_timestamp, ds.created_by_user_email, ds.last_modified_timestamp, "
              f" ds.last_modified_user_email, ds.lab_dataset_id, ds.dataset_type, METASAMPLE, PROCESSED_DATASET, REVISIONS")
 
-    logger.info("======get_prov_info() query======")
-    logger.info(query)
+    logger.debug("======get_prov_info() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        # Because we're returning multiple things, we use session.run rather than session.read_transaction
-        result = session.run(query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        # Because we're returning multiple things, we use session.run rather than session.execute_read
+        result = session.run(query, parameters)
         list_of_dictionaries = []
         for record in result:
             record_dict = {}
@@ -1806,7 +1800,7 @@ dataset_uuid : string
 
 def get_individual_prov_info(neo4j_driver, dataset_uuid):
     query = (
-        f"MATCH (ds:Dataset {{uuid: '{dataset_uuid}'}})-[:WAS_GENERATED_BY]->(a)-[:USED]->(firstSample:Sample)-[*]->(source:Source)"
+        f"MATCH (ds:Dataset {{uuid: $dataset_uuid}})-[:WAS_GENERATED_BY]->(a)-[:USED]->(firstSample:Sample)-[*]->(source:Source)"
         f" WITH ds, COLLECT(distinct source) AS SOURCE, COLLECT(distinct firstSample) AS FIRSTSAMPLE"
         f" OPTIONAL MATCH (ds)-[*]->(metaSample:Sample)"
         f" WHERE NOT metaSample.metadata IS NULL AND NOT TRIM(metaSample.metadata) = ''"
@@ -1823,13 +1817,12 @@ def get_individual_prov_info(neo4j_driver, dataset_uuid):
         f" ds.group_uuid, ds.created_timestamp, ds.created_by_user_email, ds.last_modified_timestamp, "
         f" ds.last_modified_user_email, ds.lab_dataset_id, ds.dataset_type, METASAMPLE, PROCESSED_DATASET")
 
-    logger.info("======get_prov_info() query======")
-    logger.info(query)
+    logger.debug("======get_prov_info() query======\n%s", query)
 
     record_contents = []
     record_dict = {}
-    with neo4j_driver.session() as session:
-        result = session.run(query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        result = session.run(query, dataset_uuid=dataset_uuid)
         if result.peek() is None:
             return
         for record in result:
@@ -1903,10 +1896,9 @@ def get_sankey_info(neo4j_driver):
     query = (f"MATCH (ds:Dataset)-[]->(a)-[]->(:Sample)"
              f"MATCH (source)<-[:USED]-(oa)<-[:WAS_GENERATED_BY]-(organ:Sample {{sample_category:'{Ontology.ops().specimen_categories().ORGAN}'}})<-[*]-(ds)"
              f"RETURN distinct ds.group_name, organ.organ, ds.dataset_type, ds.status, ds. uuid order by ds.group_name")
-    logger.info("======get_sankey_info() query======")
-    logger.info(query)
-    with neo4j_driver.session() as session:
-        # Because we're returning multiple things, we use session.run rather than session.read_transaction
+    logger.debug("======get_sankey_info() query======\n%s", query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        # Because we're returning multiple things, we use session.run rather than session.execute_read
         result = session.run(query)
         list_of_dictionaries = []
         for record in result:
@@ -1940,8 +1932,11 @@ param_dict : dictionary
 
 def get_sample_prov_info(neo4j_driver, param_dict):
     group_uuid_query_string = ''
+    # Same as get_prov_info(), the filter value is a parameter rather than part of the query text
+    parameters = {}
     if 'group_uuid' in param_dict:
-        group_uuid_query_string = f" WHERE toUpper(s.group_uuid) = '{param_dict['group_uuid'].upper()}'"
+        group_uuid_query_string = " WHERE toUpper(s.group_uuid) = $group_uuid"
+        parameters['group_uuid'] = param_dict['group_uuid'].upper()
     query = (
         f" MATCH (s:Sample)-[*]->(d:Source)"
         f" {group_uuid_query_string}"
@@ -1955,12 +1950,11 @@ def get_sample_prov_info(neo4j_driver, param_dict):
         f"d.sennet_id"
     )
 
-    logger.info("======get_sample_prov_info() query======")
-    logger.info(query)
+    logger.debug("======get_sample_prov_info() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        # Because we're returning multiple things, we use session.run rather than session.read_transaction
-        result = session.run(query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        # Because we're returning multiple things, we use session.run rather than session.execute_read
+        result = session.run(query, parameters)
         list_of_dictionaries = []
         for record in result:
             record_dict = {}
@@ -1998,54 +1992,61 @@ def get_sample_prov_info(neo4j_driver, param_dict):
 ####################################################################################################
 
 """
-Build the property key-value pairs to be used in the Cypher clause for node creation/update
+Build the Cypher expression projecting the given node variable to a map of the `$property_keys` query parameter
+
+The keys are bound as a parameter so the query text doesn't change with the requested keys,
+and a key missing on the node maps to null, same as `{key: n.key}`
 
 Parameters
 ----------
-entity_data_dict : dict
-    The target Entity node to be created
+variable : str
+    The node variable in the Cypher query
 
 Returns
 -------
 str
-    A string representation of the node properties map containing
-    key-value pairs to be used in Cypher clause
+    The Cypher map expression
 """
 
 
-def _build_properties_map(entity_data_dict):
-    separator = ', '
-    node_properties_list = []
+def _property_keys_projection(variable):
+    return f"apoc.map.fromLists($property_keys, [key IN $property_keys | {variable}[key]])"
 
-    for key, value in entity_data_dict.items():
-        if isinstance(value, (int, bool)):
-            # Treat integer and boolean as is
-            key_value_pair = f"{key}: {value}"
-        elif isinstance(value, str):
-            # Special case is the value is 'TIMESTAMP()' string
-            # Remove the quotes since neo4j only takes TIMESTAMP() as a function
-            if value == 'TIMESTAMP()':
-                key_value_pair = f"{key}: {value}"
-            else:
-                # Escape single quote
-                escaped_str = value.replace("'", r"\'")
-                # Quote the value
-                key_value_pair = f"{key}: '{escaped_str}'"
-        else:
-            # Convert list and dict to string
-            # Must also escape single quotes in the string to build a valid Cypher query
-            escaped_str = str(value).replace("'", r"\'")
-            # Also need to quote the string value
-            key_value_pair = f"{key}: '{escaped_str}'"
 
-        # Add to the list
-        node_properties_list.append(key_value_pair)
+"""
+Build the query filtering the given related entities (siblings or tuplets) by `$uuids` and `$status`,
+the uuids and status are bound as parameters so only a handful of distinct query strings exist
+and each one is built once per process
+
+Parameters
+----------
+filter_status : bool
+    Whether to keep only the Datasets with the `$status` (lowercase), non-Dataset entities are always kept
+prop_key : str
+    A target property key for result filtering, None to return the nodes
+exclude_revisions : bool
+    Whether to leave out the entities that have been revised
+
+Returns
+-------
+str
+    The Cypher query
+"""
+
 
-    # Example: {uuid: 'eab7fd6911029122d9bbd4d96116db9b', rui_location: 'Joe <info>', lab_tissue_sample_id: 'dadsadsd'}
-    # Note: all the keys are not quoted, otherwise Cypher syntax error
-    node_properties_map = f"{{ {separator.join(node_properties_list)} }}"
+@functools.lru_cache(maxsize=32)
+def _build_related_entities_query(filter_status, prop_key, exclude_revisions):
+    revision_query_string = "AND NOT (e)<-[:REVISION_OF]-(:Entity) " if exclude_revisions else ""
+    status_query_string = "AND (NOT e:Dataset OR TOLOWER(e.status) = $status) " if filter_status else ""
+    prop_query_string = f"RETURN COLLECT(DISTINCT e) AS {record_field_name}"
+    if prop_key is not None:
+        prop_query_string = f"RETURN COLLECT(DISTINCT e.{prop_key}) AS {record_field_name}"
 
-    return node_properties_map
+    return ("MATCH (e:Entity) "
+            "WHERE e.uuid IN $uuids "
+            f"{revision_query_string}"
+            f"{status_query_string}"
+            f"{prop_query_string}")
 
 
 """
@@ -2067,7 +2068,8 @@ neo4j.Record or None
 
 def _execute_readonly_tx(tx, query, **kwargs):
     result = tx.run(query, **kwargs)
-    record = result.single()
+    # None if there is no record, single() also exhausts the result so the server cursor is released right away
+    record = result.single(strict=False)
     return record
 
 
@@ -2087,28 +2089,29 @@ relationship : str
 direction: str
     The relationship direction from source node to target node: outgoing `->` or incoming `<-`
     Neo4j CQL CREATE command supports only directional relationships
+source_label : str
+    The label of source node, Entity or Activity, so the node is looked up by its uuid index
+target_label : str
+    The label of target node, Entity or Activity
 """
 
 
-def _create_relationship_tx(tx, source_node_uuid, target_node_uuid, relationship, direction):
-    incoming = "-"
-    outgoing = "-"
-
-    if direction == "<-":
-        incoming = direction
-
-    if direction == "->":
-        outgoing = direction
+def _create_relationship_tx(tx, source_node_uuid, target_node_uuid, relationship, direction,
+                            source_label='Entity', target_label='Entity'):
+    # The relationship type and direction are passed as parameters via apoc.create.relationship()
+    # so the same query text (and cached query plan) is used for every relationship
+    query = (f"MATCH (s:{source_label} {{uuid: $source_uuid}}), (t:{target_label} {{uuid: $target_uuid}}) "
+             "CALL apoc.create.relationship(CASE $direction WHEN '<-' THEN t ELSE s END, $relationship, {}, "
+             "CASE $direction WHEN '<-' THEN s ELSE t END) YIELD rel "
+             f"RETURN type(rel) AS {record_field_name}")
 
-    query = ("MATCH (s), (t) "
-             f"WHERE s.uuid = '{source_node_uuid}' AND t.uuid = '{target_node_uuid}' "
-             f"CREATE (s){incoming}[r:{relationship}]{outgoing}(t) "
-             f"RETURN type(r) AS {record_field_name}")
+    logger.debug("======_create_relationship_tx() query======\n%s", query)
 
-    logger.info("======_create_relationship_tx() query======")
-    logger.info(query)
-
-    tx.run(query)
+    tx.run(query,
+           source_uuid=source_node_uuid,
+           target_uuid=target_node_uuid,
+           relationship=relationship,
+           direction=direction)
 
 
 """
@@ -2127,12 +2130,7 @@ dict
 
 
 def _node_to_dict(entity_node):
-    entity_dict = {}
-
-    for key, value in entity_node._properties.items():
-        entity_dict.setdefault(key, value)
-
-    return entity_dict
+    return dict(entity_node)
 
 
 """
@@ -2151,13 +2149,7 @@ list
 
 
 def _nodes_to_dicts(nodes):
-    dicts = []
-
-    for node in nodes:
-        entity_dict = _node_to_dict(node)
-        dicts.append(entity_dict)
-
-    return dicts
+    return [dict(node) for node in nodes]
 
 
 """
@@ -2178,16 +2170,15 @@ neo4j.node
 
 
 def _create_activity_tx(tx, activity_data_dict):
-    node_properties_map = _build_properties_map(activity_data_dict)
+    node_properties_map, parameterized_data = schema_neo4j_queries.build_parameterized_map(activity_data_dict)
 
     query = (f"CREATE (e:Activity) "
              f"SET e = {node_properties_map} "
              f"RETURN e AS {record_field_name}")
 
-    logger.info("======_create_activity_tx() query======")
-    logger.info(query)
+    logger.debug("======_create_activity_tx() query======\n%s", query)
 
-    result = tx.run(query)
+    result = tx.run(query, parameterized_data)
     record = result.single()
     node = record[record_field_name]
 
@@ -2209,7 +2200,7 @@ direct_ancestor_uuid : str
 """
 def create_multiple_datasets(neo4j_driver, datasets_dict_list, activity_data_dict, direct_ancestor_uuid):
     try:
-        with neo4j_driver.session() as session:
+        with neo4j_helper.new_session(neo4j_driver) as session:
             entity_dict = {}
 
             tx = session.begin_transaction()
@@ -2220,26 +2211,25 @@ def create_multiple_datasets(neo4j_driver, datasets_dict_list, activity_data_dic
             _create_activity_tx(tx, activity_data_dict)
 
             # Step 2: create relationship from source entity node to this Activity node
-            _create_relationship_tx(tx, direct_ancestor_uuid, activity_uuid, 'USED', '<-')
+            _create_relationship_tx(tx, direct_ancestor_uuid, activity_uuid, 'USED', '<-', target_label='Activity')
 
             # Step 3: create each new sample node and link to the Activity node at the same time
             output_dicts_list = []
             for dataset_dict in datasets_dict_list:
                 # Remove dataset_link_abs_dir once more before entity creation
                 dataset_link_abs_dir = dataset_dict.pop('dataset_link_abs_dir', None)
-                node_properties_map = _build_properties_map(dataset_dict)
+                node_properties_map, parameterized_data = schema_neo4j_queries.build_parameterized_map(dataset_dict)
 
                 query = (f"MATCH (a:Activity) "
-                         f"WHERE a.uuid = '{activity_uuid}' "
+                         f"WHERE a.uuid = $activity_uuid "
                          # Always define the Entity label in addition to the target `entity_type` label
                          f"CREATE (e:Entity:Dataset {node_properties_map} ) "
                          f"CREATE (a)<-[:WAS_GENERATED_BY]-(e)"
                          f"RETURN e AS {record_field_name}")
 
-                logger.info("======create_multiple_samples() individual query======")
-                logger.info(query)
+                logger.debug("======create_multiple_samples() individual query======\n%s", query)
 
-                result = tx.run(query)
+                result = tx.run(query, parameterized_data, activity_uuid=activity_uuid)
                 record = result.single()
                 entity_node = record[record_field_name]
                 entity_dict = _node_to_dict(entity_node)
@@ -2281,25 +2271,12 @@ dict
 """
 def get_siblings(neo4j_driver, uuid, status, prop_key, include_revisions):
     sibling_uuids = schema_neo4j_queries.get_siblings(neo4j_driver, uuid, property_key='uuid')
-    sibling_uuids_string = str(sibling_uuids)
-    revision_query_string = "AND NOT (e)<-[:REVISION_OF]-(:Entity) "
-    status_query_string = ""
-    prop_query_string = f"RETURN apoc.coll.toSet(COLLECT(e)) AS {record_field_name}"
-    if include_revisions:
-        revision_query_string = ""
-    if status is not None:
-        status_query_string = f"AND (NOT e:Dataset OR TOLOWER(e.status) = '{status}') "
-    if prop_key is not None:
-        prop_query_string = f"RETURN apoc.coll.toSet(COLLECT(e.{prop_key})) AS {record_field_name}"
     results = []
-    query = ("MATCH (e:Entity) "
-             f"WHERE e.uuid IN {sibling_uuids_string} "
-             f"{revision_query_string}"
-             f"{status_query_string}"
-             f"{prop_query_string}")
+    query = _build_related_entities_query(status is not None, prop_key, not include_revisions)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(schema_neo4j_queries.execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(schema_neo4j_queries.execute_readonly_tx, query,
+                                          uuids=sibling_uuids, status=status)
 
         if record and record[record_field_name]:
             if prop_key:
@@ -2330,21 +2307,12 @@ dict
 """
 def get_tuplets(neo4j_driver, uuid, status, prop_key):
     tuplet_uuids = schema_neo4j_queries.get_tuplets(neo4j_driver, uuid, property_key='uuid')
-    tuplets_uuids_string = str(tuplet_uuids)
-    status_query_string = ""
-    prop_query_string = f"RETURN apoc.coll.toSet(COLLECT(e)) AS {record_field_name}"
-    if status is not None:
-        status_query_string = f"AND (NOT e:Dataset OR TOLOWER(e.status) = '{status}') "
-    if prop_key is not None:
-        prop_query_string = f"RETURN apoc.coll.toSet(COLLECT(e.{prop_key})) AS {record_field_name}"
     results = []
-    query = ("MATCH (e:Entity) "
-             f"WHERE e.uuid IN {tuplets_uuids_string} "
-             f"{status_query_string}"
-             f"{prop_query_string}")
+    query = _build_related_entities_query(status is not None, prop_key, False)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(schema_neo4j_queries.execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(schema_neo4j_queries.execute_readonly_tx, query,
+                                          uuids=tuplet_uuids, status=status)
 
         if record and record[record_field_name]:
             if prop_key:
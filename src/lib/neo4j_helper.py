@@ -0,0 +1,197 @@
+import logging
+import threading
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from neo4j import GraphDatabase, READ_ACCESS, WRITE_ACCESS
+
+logger = logging.getLogger(__name__)
+
+# One long-lived driver (and its connection pool) per uri, shared by all the threads of this process
+_drivers = {}
+_lock = threading.Lock()
+# The database all the sessions run against, set with the shared driver
+# None lets the server resolve the user's home database, which costs an extra round trip on every session open
+_database = None
+
+
+def create_driver(uri, username, password, max_connection_pool_size=None, connection_acquisition_timeout=None,
+                  max_connection_lifetime=None, keep_alive=None):
+    """
+    Create a new neo4j driver, the pool settings that are None fall back to the neo4j driver defaults
+
+    Parameters
+    ----------
+    uri : str
+        The neo4j bolt uri
+    username : str
+        The neo4j username
+    password : str
+        The neo4j password
+    max_connection_pool_size : int
+        The maximum number of connections kept in the pool, should be larger than the number of threads per process
+    connection_acquisition_timeout : float
+        Seconds to wait for a free connection from the pool before giving up
+    max_connection_lifetime : float
+        Seconds a pooled connection is kept before it is closed and replaced
+    keep_alive : bool
+        Whether to enable TCP keep-alive on the pooled connections, so idle ones aren't silently dropped by firewalls
+
+    Returns
+    -------
+    neo4j.Driver
+        The new neo4j driver
+    """
+    pool_config = {
+        'max_connection_pool_size': max_connection_pool_size,
+        'connection_acquisition_timeout': connection_acquisition_timeout,
+        'max_connection_lifetime': max_connection_lifetime,
+        'keep_alive': keep_alive
+    }
+
+    return GraphDatabase.driver(uri,
+                                auth=(username, password),
+                                **{key: value for key, value in pool_config.items() if value is not None})
+
+
+def instance(uri, username, password, database=None, **pool_config):
+    """
+    Get the neo4j driver for the given uri, the driver is only created on the first call
+
+    Parameters
+    ----------
+    uri : str
+        The neo4j bolt uri
+    username : str
+        The neo4j username
+    password : str
+        The neo4j password
+    database : str
+        The neo4j database the sessions run against, None to use the user's home database.
+        Only set along with the first driver, a different database in a later call is ignored
+    pool_config : dict
+        The connection pool settings passed to create_driver(), only used when the driver is created
+
+    Returns
+    -------
+    neo4j.Driver
+        The shared neo4j driver
+    """
+    global _database
+
+    with _lock:
+        if uri not in _drivers:
+            _drivers[uri] = create_driver(uri, username, password, **pool_config)
+            _database = database
+            logger.info(f"Created neo4j driver for {uri} (database {database}) with pool config {pool_config}")
+        elif database != _database:
+            # All the sessions share one database, it is set along with the first driver
+            logger.warning(f"Ignored neo4j database {database} for {uri}, the sessions run against {_database}")
+
+        return _drivers[uri]
+
+
+def close():
+    """
+    Close all the drivers created by instance() along with their connection pools
+    """
+    with _lock:
+        for driver in _drivers.values():
+            driver.close()
+
+        _drivers.clear()
+
+
+def _request_bookmark_manager():
+    """
+    Get the bookmark manager shared by all the sessions of the current request
+
+    The write sessions hand their bookmarks to it and the read session waits for them, so the reads
+    following a write in the same request (e.g. the after create/update triggers) see that write
+    even when they are routed to another member of a cluster.
+
+    Returns
+    -------
+    neo4j.BookmarkManager or None
+        The bookmark manager, None outside of a request
+    """
+    if not has_request_context():
+        return None
+
+    if 'neo4j_bookmark_manager' not in g:
+        g.neo4j_bookmark_manager = GraphDatabase.bookmark_manager()
+
+    return g.neo4j_bookmark_manager
+
+
+def new_session(neo4j_driver):
+    """
+    Open a new session on the configured database, used by the writes which can't share the read session
+
+    Within a request the session shares the request bookmark manager, so the later reads see its writes
+
+    Parameters
+    ----------
+    neo4j_driver : neo4j.Driver
+        The neo4j driver the session is created from
+
+    Returns
+    -------
+    neo4j.Session
+        The neo4j session, to be used as a context manager so it gets closed
+    """
+    return neo4j_driver.session(database=_database, bookmark_manager=_request_bookmark_manager())
+
+
+@contextmanager
+def session(neo4j_driver):
+    """
+    Get the session that is reused by all the read queries of the current request
+
+    The session is opened on first use and closed by close_request_sessions() when the request ends.
+    Outside of a request (e.g. a worker thread) a new session is opened and closed on exit,
+    since sessions are not thread-safe. Only use it for managed transactions or fully consumed
+    results, a shared session can only run one transaction at a time.
+    In GET/HEAD requests the session defaults to read access so its auto-commit queries can also be
+    routed to the read replicas of a cluster, other requests default to write access. Writes must
+    use their own sessions from new_session(), the request bookmark manager they share with this
+    session makes the reads after a write wait for it.
+
+    Parameters
+    ----------
+    neo4j_driver : neo4j.Driver
+        The neo4j driver the session is created from
+
+    Yields
+    ------
+    neo4j.Session
+        The neo4j session
+    """
+    if not has_request_context():
+        with neo4j_driver.session(database=_database, default_access_mode=READ_ACCESS) as worker_session:
+            yield worker_session
+        return
+
+    sessions = g.setdefault('neo4j_sessions', {})
+
+    if id(neo4j_driver) not in sessions:
+        access_mode = READ_ACCESS if request.method in ['GET', 'HEAD'] else WRITE_ACCESS
+        sessions[id(neo4j_driver)] = neo4j_driver.session(database=_database,
+                                                          default_access_mode=access_mode,
+                                                          bookmark_manager=_request_bookmark_manager())
+
+    yield sessions[id(neo4j_driver)]
+
+
+def close_request_sessions():
+    """
+    Close the neo4j sessions opened by session() during the current request
+    """
+    sessions = g.pop('neo4j_sessions', {})
+    g.pop('neo4j_bookmark_manager', None)
+
+    for request_session in sessions.values():
+        try:
+            request_session.close()
+        except Exception:
+            logger.exception("Failed to close the request neo4j session")
@@ -0,0 +1,94 @@
+import copy
+import functools
+
+from flask import g, has_request_context, request
+
+
+def is_request_cacheable():
+    """
+    Whether the neo4j read results can be cached for the current request, only GET/HEAD requests
+    are cached since they don't write to neo4j
+
+    Returns
+    -------
+    bool
+        True if in a GET/HEAD request
+    """
+    return has_request_context() and request.method in ['GET', 'HEAD']
+
+
+def request_cache_key(func_name, *args, **kwargs):
+    """
+    Build the request cache key of a neo4j read function call
+
+    Parameters
+    ----------
+    func_name : str
+        The name of the read function
+    args : tuple
+        The positional arguments, without the neo4j driver
+    kwargs : dict
+        The keyword arguments
+
+    Returns
+    -------
+    tuple
+        The cache key
+    """
+    return func_name, args, tuple(sorted(kwargs.items()))
+
+
+def get_request_cache():
+    """
+    Get the neo4j read results cached for the current request
+
+    Returns
+    -------
+    dict or None
+        The cached results keyed by request_cache_key(), None if the current request isn't cacheable
+    """
+    if not is_request_cacheable():
+        return None
+
+    return g.setdefault('neo4j_cache', {})
+
+
+def request_cached(func):
+    """
+    Decorator caching the results of a neo4j read function for the lifetime of the current request
+
+    The driver argument is left out of the cache key. The cache only applies to GET/HEAD requests,
+    which don't write to neo4j, so a cached result can't go stale within the request.
+    Calls outside of a request (e.g. from a worker thread) or with unhashable arguments always run the query.
+
+    Parameters
+    ----------
+    func : function
+        The read function, taking the neo4j driver as its first argument
+
+    Returns
+    -------
+    function
+        The wrapped function
+    """
+    @functools.wraps(func)
+    def wrapper(neo4j_driver, *args, **kwargs):
+        cache = get_request_cache()
+
+        if cache is None:
+            return func(neo4j_driver, *args, **kwargs)
+
+        key = request_cache_key(func.__name__, *args, **kwargs)
+
+        try:
+            hash(key)
+        except TypeError:
+            return func(neo4j_driver, *args, **kwargs)
+
+        if key not in cache:
+            cache[key] = func(neo4j_driver, *args, **kwargs)
+
+        # The callers may modify the returned lists and dicts
+        return copy.deepcopy(cache[key])
+
+    return wrapper
@@ -4,7 +4,7 @@ import logging
 import requests
 from datetime import datetime
 
-from flask import Response
+from flask import Response, g, has_request_context
 from hubmap_commons.file_helper import ensureTrailingSlashURL
 from hubmap_commons.string_helper import convert_str_literal
 
@@ -35,6 +35,8 @@ requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
 # In Python, "privacy" depends on "consenting adults'" levels of agreement, we can't force it.
 # A single leading underscore means you're not supposed to access it "from the outside"
 _schema = None
+# The merged class and superclass properties, keyed by (schema section, normalized class)
+_entity_properties = {}
 _uuid_api_url = None
 _entity_api_url = None
 _ingest_api_url = None
@@ -90,6 +92,7 @@ def initialize(valid_yaml_file,
 
     logger.info(f"Initialize schema_manager using valid_yaml_file={valid_yaml_file}.")
     _schema = load_provenance_schema(valid_yaml_file)
+    _entity_properties.clear()
     if _schema is None:
         logger.error(f"Failed to load _schema using {valid_yaml_file}.")
     _uuid_api_url = uuid_api_url
@@ -262,6 +265,9 @@ def extend_dicts(dict1: dict, dict2: dict) -> dict:
 """
 Gets all properties by entity
 
+The merged properties are built once per class since the schema doesn't change after initialize(),
+the returned dict is shared and must not be modified
+
 Returns
 -------
 dict
@@ -270,14 +276,19 @@ dict
 
 
 def get_entity_properties(schema_section: dict, normalized_class: str) -> dict:
-    properties = schema_section[normalized_class]['properties']
-    super_class = schema_section[normalized_class].get('superclass')
+    cache_key = (id(schema_section), normalized_class)
+
+    if cache_key not in _entity_properties:
+        properties = schema_section[normalized_class]['properties']
+        super_class = schema_section[normalized_class].get('superclass')
 
-    if super_class is not None and super_class in schema_section:
-        super_class_properties = schema_section[super_class]['properties']
-        return extend_dicts(dict(super_class_properties), dict(properties))
+        if super_class is not None and super_class in schema_section:
+            super_class_properties = schema_section[super_class]['properties']
+            _entity_properties[cache_key] = extend_dicts(dict(super_class_properties), dict(properties))
+        else:
+            _entity_properties[cache_key] = dict(properties)
 
-    return dict(properties)
+    return _entity_properties[cache_key]
 
 
 """
@@ -422,6 +433,13 @@ def generate_triggered_data(trigger_type: TriggerTypeEnum, normalized_class, use
     # before_create_trigger|before_update_trigger|on_read_trigger
     # No property value to be set for: after_create_trigger|after_update_trigger
     trigger_generated_data_dict = {}
+
+    # Let the triggers know which properties get generated along with them, e.g. the Dataset read triggers
+    # only bundle the lookups of the properties not skipped. The triggers can generate the data of other
+    # entities in between, so the previous value is restored after the loop
+    previous_triggered_properties = _set_triggered_properties(
+        [key for key in properties if (trigger_type.value in properties[key]) and (key not in properties_to_skip)])
+
     for key in properties:
         # Among those properties that have the target trigger type,
         # we can skip the ones specified in the `properties_to_skip` by not running their triggers
@@ -585,10 +603,54 @@ def generate_triggered_data(trigger_type: TriggerTypeEnum, normalized_class, use
                         # No need to raise exception
                         trigger_generated_data_dict[key] = msg
 
+    _set_triggered_properties(previous_triggered_properties)
+
     # Return after for loop
     return trigger_generated_data_dict
 
 
+"""
+Get the properties whose triggers run in the current generate_triggered_data() call
+
+Returns
+-------
+list
+    The property keys, empty outside of a request or of generate_triggered_data()
+"""
+
+
+def get_triggered_properties():
+    if not has_request_context():
+        return []
+
+    return g.get('triggered_properties', [])
+
+
+"""
+Set the properties whose triggers run in the current generate_triggered_data() call of the request
+
+Parameters
+----------
+property_keys : list
+    The property keys
+
+Returns
+-------
+list
+    The previous property keys
+"""
+
+
+def _set_triggered_properties(property_keys):
+    if not has_request_context():
+        return []
+
+    previous_property_keys = g.get('triggered_properties', [])
+    g.triggered_properties = property_keys
+
+    return previous_property_keys
+
+
 """
 Filter out the merged dict by getting rid of properties with None values
 This method is used by get_complete_entity_result() for the 'on_read_trigger'
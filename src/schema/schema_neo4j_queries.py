@@ -1,13 +1,65 @@
 import ast
+import copy
+import functools
 
 from neo4j.exceptions import TransactionError
 import logging
 
+from lib import neo4j_helper
+from lib.query_cache import get_request_cache, request_cache_key, request_cached
+
 logger = logging.getLogger(__name__)
 
 # The filed name of the single result record
 record_field_name = 'result'
 
+# The apoc path expander config walking the provenance up to the Source ancestors, the traversal stops at each Source
+# No maxLevel since the provenance depth isn't bounded by the data model
+source_expansion_config = "{relationshipFilter: 'WAS_GENERATED_BY>|USED>', labelFilter: '/Source', minLevel: 1}"
+
+# The single entity lookups run on almost every read, their queries only take the uuid as $uuid
+# so they are built once at import instead of on every call
+entity_query = f"MATCH (e:Entity {{uuid: $uuid}}) RETURN e AS {record_field_name}"
+entity_type_query = f"MATCH (e:Entity {{uuid: $uuid}}) RETURN e.entity_type AS {record_field_name}"
+entity_creation_action_query = (f"MATCH (e:Entity {{uuid: $uuid}})-[:WAS_GENERATED_BY]->(a:Activity) "
+                                f"RETURN a.creation_action AS {record_field_name}")
+previous_revision_uuid_query = (f"MATCH (e:Entity {{uuid: $uuid}})-[:REVISION_OF]->(previous_revision:Entity) "
+                                f"RETURN previous_revision.uuid AS {record_field_name}")
+next_revision_uuid_query = (f"MATCH (e:Entity {{uuid: $uuid}})<-[:REVISION_OF]-(next_revision:Entity) "
+                            f"RETURN next_revision.uuid AS {record_field_name}")
+dataset_upload_query = f"MATCH (e:Entity {{uuid: $uuid}})-[:IN_UPLOAD]->(s:Upload) RETURN s AS {record_field_name}"
+
+# Same for the related entities lookups without a property key,
+# the property key variants are still built per call since the key can't be a parameter
+siblings_query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent:Entity) "
+                  # filter out the Lab entities
+                  f"WHERE e.uuid=$uuid AND parent.entity_type <> 'LAB' "
+                  f"MATCH (sibling:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent) "
+                  f"WHERE sibling <> e "
+                  # A sibling sharing more than one parent is matched once per parent, keep the unique ones
+                  # properties() hands back plain maps, no Node to dict conversion needed on our side
+                  f"WITH DISTINCT sibling "
+                  f"RETURN COLLECT(properties(sibling)) AS {record_field_name}")
+# The tuplets are generated by the same activity, one connected pattern expanding from the uuid index seek
+tuplets_match = ("MATCH (e:Entity {uuid: $uuid})-[:WAS_GENERATED_BY]->(a:Activity)<-[:WAS_GENERATED_BY]-(tuplet:Entity), "
+                 "(a)-[:USED]->(parent:Entity) "
+                 # filter out the Lab entities
+                 "WHERE parent.entity_type <> 'Lab' AND tuplet <> e ")
+# properties() hands back plain maps, no Node to dict conversion needed on our side
+tuplets_query = f"{tuplets_match}WITH DISTINCT tuplet RETURN COLLECT(properties(tuplet)) AS {record_field_name}"
+# The collections and uploads lookups only differ by their MATCH, which binds the linked entities to n
+collections_match = "MATCH (n:Collection)<-[:IN_COLLECTION]-(e:Entity {uuid: $uuid}) "
+uploads_match = "MATCH (n:Upload)<-[:IN_UPLOAD]-(ds:Dataset {uuid: $uuid}) "
+collections_query = f"{collections_match}WITH DISTINCT n RETURN COLLECT(properties(n)) AS {record_field_name}"
+uploads_query = f"{uploads_match}WITH DISTINCT n RETURN COLLECT(properties(n)) AS {record_field_name}"
+# Expand the provenance once with a visited set instead of enumerating every path to each source,
+# stopping at the sources. The excluded uuids are passed as a parameter, an empty list filters out nothing
+# subgraphNodes() yields each node once, properties() hands back plain maps instead of nodes
+sources_associated_entity_query = (f"MATCH (e:Entity {{uuid: $uuid}}) "
+                                   f"CALL apoc.path.subgraphNodes(e, {source_expansion_config}) YIELD node AS s "
+                                   f"WITH s WHERE NOT s.uuid IN $filter_out "
+                                   f"RETURN COLLECT(properties(s)) as {record_field_name}")
+
 ####################################################################################################
 ## Directly called by schema_triggers.py
 ####################################################################################################
@@ -34,20 +86,20 @@ list
 def get_dataset_direct_ancestors(neo4j_driver, uuid, property_key=None):
     results = []
     if property_key:
+        _validate_property_key(property_key)
         query = (f"MATCH (s:Entity)<-[:USED]-(a:Activity)<-[:WAS_GENERATED_BY]-(t:Dataset) "
-                 f"WHERE t.uuid = '{uuid}' "
-                 f"RETURN apoc.coll.toSet(COLLECT(s.{property_key})) AS {record_field_name}")
+                 f"WHERE t.uuid = $uuid "
+                 f"RETURN COLLECT(DISTINCT s.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (s:Entity)<-[:USED]-(a:Activity)<-[:WAS_GENERATED_BY]-(t:Dataset) "
-                 f"WHERE t.uuid = '{uuid}' "
-                 f"RETURN apoc.coll.toSet(COLLECT(s)) AS {record_field_name}")
+                 f"WHERE t.uuid = $uuid "
+                 f"RETURN COLLECT(DISTINCT s) AS {record_field_name}")
 
-    logger.info("======get_dataset_direct_ancestors() query======")
-    logger.info(query)
+    logger.debug("======get_dataset_direct_ancestors() query======\n%s", query)
 
     # Sessions will often be created and destroyed using a with block context
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -55,7 +107,7 @@ def get_dataset_direct_ancestors(neo4j_driver, uuid, property_key=None):
                 results = record[record_field_name]
             else:
                 # Convert the list of nodes to a list of dicts
-                results = _nodes_to_dicts(record[record_field_name])
+                results = nodes_to_dicts(record[record_field_name])
 
     return results
 
@@ -82,20 +134,20 @@ list
 def get_dataset_direct_descendants(neo4j_driver, uuid, property_key=None, match_case = ''):
     results = []
     if property_key:
+        _validate_property_key(property_key)
         query = (f"MATCH (s:Entity)-[:WAS_GENERATED_BY]->(a:Activity)-[:USED]->(t:Dataset) "
-                 f"WHERE t.uuid = '{uuid}' {match_case}"
-                 f"RETURN apoc.coll.toSet(COLLECT(s.{property_key})) AS {record_field_name}")
+                 f"WHERE t.uuid = $uuid {match_case}"
+                 f"RETURN COLLECT(DISTINCT s.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (s:Entity)-[:WAS_GENERATED_BY]->(a:Activity)-[:USED]->(t:Dataset) "
-                 f"WHERE t.uuid = '{uuid}' {match_case}"
-                 f"RETURN apoc.coll.toSet(COLLECT(s)) AS {record_field_name}")
+                 f"WHERE t.uuid = $uuid {match_case}"
+                 f"RETURN COLLECT(DISTINCT s) AS {record_field_name}")
 
-    logger.info("======get_dataset_direct_descendants() query======")
-    logger.info(query)
+    logger.debug("======get_dataset_direct_descendants() query======\n%s", query)
 
     # Sessions will often be created and destroyed using a with block context
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -103,7 +155,7 @@ def get_dataset_direct_descendants(neo4j_driver, uuid, property_key=None, match_
                 results = record[record_field_name]
             else:
                 # Convert the list of nodes to a list of dicts
-                results = _nodes_to_dicts(record[record_field_name])
+                results = nodes_to_dicts(record[record_field_name])
 
     return results
 
@@ -118,7 +170,7 @@ neo4j_driver : neo4j.Driver object
 direct_ancestor_uuids : list
     List of the uuids to be filtered
 entity_type : string
-    The entity to be excluded
+    The normalized entity type to be excluded, as stored in the entity_type property (e.g. Dataset)
 
 Returns
 -------
@@ -128,14 +180,18 @@ dict
 
 
 def filter_ancestors_by_type(neo4j_driver, direct_ancestor_uuids, entity_type):
-    query = (f"MATCH (e:Entity) "
-             f"WHERE e.uuid in {direct_ancestor_uuids} AND toLower(e.entity_type) <> '{entity_type.lower()}' "
-             f"RETURN e.entity_type AS entity_type, collect(e.uuid) AS uuids")
-    logger.info("======filter_ancestors_by_type======")
-    logger.info(query)
+    query = ("MATCH (e:Entity) "
+             # Compare the stored normalized type directly, no toLower() on every row
+             "WHERE e.uuid IN $uuids AND e.entity_type <> $entity_type "
+             "RETURN e.entity_type AS entity_type, collect(e.uuid) AS uuids")
+    logger.debug("======filter_ancestors_by_type======\n%s", query)
+
+    # One row per entity type, run as a managed read transaction so the driver retries it on transient errors
+    def _filter_tx(tx):
+        return tx.run(query, uuids=list(direct_ancestor_uuids), entity_type=entity_type).data()
 
-    with neo4j_driver.session() as session:
-        records = session.run(query).data()
+    with neo4j_helper.session(neo4j_driver) as session:
+        records = session.execute_read(_filter_tx)
 
     return records if records else None
 
@@ -159,21 +215,21 @@ list
 """
 
 
+@request_cached
 def get_origin_samples(neo4j_driver, uuid):
     result = {}
 
-    query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY|USED*]->(s:Sample) "
-             f"WHERE e.uuid='{uuid}' and s.sample_category='Organ' "
-             f"return apoc.coll.toSet(COLLECT(s)) AS {record_field_name}")
+    query = (f"MATCH (e:Entity {{uuid: $uuid}})-[:WAS_GENERATED_BY|USED*]->(s:Sample {{sample_category: 'Organ'}}) "
+             # properties() hands back plain maps, no Node to dict conversion needed on our side
+             f"WITH DISTINCT s "
+             f"RETURN COLLECT(properties(s)) AS {record_field_name}")
 
-    logger.info("======get_origin_sample() query======")
-    logger.info(query)
+    logger.debug("======get_origin_samples() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
         if record and record[record_field_name]:
-            # Convert the entity node to dict
-            result = _nodes_to_dicts(record[record_field_name])
+            result = record[record_field_name]
 
     return result
 
@@ -200,71 +256,93 @@ def get_dataset_organ_and_source_info(neo4j_driver, uuid):
     source_metadata = set()
     source_type = None
 
-    with neo4j_driver.session() as session:
-        sample_query = (f"MATCH (e:Dataset)-[:USED|WAS_GENERATED_BY*]->(s:Sample) "
-                        f"WHERE e.uuid='{uuid}' AND s.sample_category is not null and s.sample_category='Organ' "
-                        f"RETURN apoc.coll.toSet(COLLECT(s)) AS {record_field_name}")
-
-        logger.info("======get_dataset_organ_and_source_info() sample_query======")
-        logger.info(sample_query)
-
-        with neo4j_driver.session() as session:
-            record = session.read_transaction(_execute_readonly_tx, sample_query)
-
-            if record and record[record_field_name]:
-                # Convert the list of nodes to a list of dicts
-                sample_records = _nodes_to_dicts(record[record_field_name])
-                for sample_record in sample_records:
-                    if sample_record['organ'] is None:
-                        organ_names.add(sample_record['sample_category'])
-                    else:
-                        organ_names.add(sample_record['organ'])
-
-                    sample_uuid = sample_record['uuid']
+    # One query for the organ samples and their sources instead of one more source query per sample
+    # Like the per sample source queries, only the first source of each sample is used
+    query = (f"MATCH (e:Dataset {{uuid: $uuid}})-[:USED|WAS_GENERATED_BY*]->(s:Sample {{sample_category: 'Organ'}}) "
+             f"WITH DISTINCT s "
+             f"OPTIONAL MATCH (s)-[:USED|WAS_GENERATED_BY*]->(d:Source) "
+             f"WITH s, HEAD(COLLECT(d {{.metadata, .source_type}})) AS source "
+             f"RETURN COLLECT({{organ_name: COALESCE(s.organ, s.sample_category), source: source}}) "
+             f"AS {record_field_name}")
 
-                    source_query = (f"MATCH (s:Sample)-[:USED|WAS_GENERATED_BY*]->(d:Source) "
-                                    f"WHERE s.uuid='{sample_uuid}' AND s.sample_category is not null "
-                                    f"RETURN DISTINCT d.metadata AS source_metadata, d.source_type AS source_type")
+    logger.debug("======get_dataset_organ_and_source_info() query======\n%s", query)
 
-                    logger.info("======get_dataset_organ_and_source_info() source_query======")
-                    logger.info(source_query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
-                    source_record = session.read_transaction(_execute_readonly_tx, source_query)
+    for row in (record[record_field_name] if record else []):
+        organ_names.add(row['organ_name'])
 
-                    if source_record:
-                        source_metadata.add(source_record[0])
-                        source_type = source_record[1]
+        if row['source']:
+            source_metadata.add(row['source']['metadata'])
+            # The source type of the last sample wins
+            source_type = row['source']['source_type']
 
     return organ_names, source_metadata, source_type
 
 
+@request_cached
 def get_entity_type(neo4j_driver, entity_uuid: str) -> str:
-    query: str = f"Match (ent {{uuid: '{entity_uuid}'}}) return ent.entity_type"
+    logger.debug("======get_entity_type() query======\n%s", entity_type_query)
 
-    logger.info("======get_entity_type() query======")
-    logger.info(query)
-
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, entity_type_query, uuid=entity_uuid)
         if record and len(record) == 1:
             return record[0]
 
     return None
 
 
+@request_cached
 def get_entity_creation_action_activity(neo4j_driver, entity_uuid: str) -> str:
-    query: str = f"MATCH (ds {{uuid:'{entity_uuid}'}})-[:WAS_GENERATED_BY]->(a:Activity) RETURN a.creation_action"
-
-    logger.info("======get_entity_creation_action() query======")
-    logger.info(query)
+    logger.debug("======get_entity_creation_action() query======\n%s", entity_creation_action_query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, entity_creation_action_query, uuid=entity_uuid)
         if record and len(record) == 1:
             return record[0]
 
     return None
 
+
+"""
+Get the creation_action of the Activity that generated each of the given entities in one query
+
+Parameters
+----------
+neo4j_driver : neo4j.Driver object
+    The neo4j database connection pool
+entity_uuids : list
+    The uuids of the target entities
+
+Returns
+-------
+dict
+    The creation_action keyed by entity uuid, None if an entity has no generating Activity
+"""
+
+
+def get_entities_creation_action_activities(neo4j_driver, entity_uuids):
+    results = dict.fromkeys(entity_uuids)
+
+    query = ("MATCH (e:Entity)-[:WAS_GENERATED_BY]->(a:Activity) "
+             "WHERE e.uuid IN $uuids "
+             f"RETURN e.uuid AS uuid, a.creation_action AS {record_field_name}")
+
+    logger.debug("======get_entities_creation_action_activities() query======\n%s", query)
+
+    # One row per entity, run as a managed read transaction so the driver retries it on transient errors
+    def _creation_action_tx(tx):
+        return tx.run(query, uuids=list(entity_uuids)).data()
+
+    with neo4j_helper.session(neo4j_driver) as session:
+        records = session.execute_read(_creation_action_tx)
+
+    for record in records:
+        results[record['uuid']] = record[record_field_name]
+
+    return results
+
 """
 Create or recreate one or more linkages
 between the target entity node and the collection nodes in neo4j
@@ -284,24 +362,19 @@ direct_ancestor_uuids : list
 
 
 def link_collection_to_entity(neo4j_driver, entity_uuid, direct_ancestor_uuids):
-    try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
+    # Run as a managed write transaction so the driver retries it on transient errors
+    def _link_tx(tx):
+        # One statement for all the Collections, _create_relationship_tx() unwinds the uuid list
+        _create_relationship_tx(tx, list(direct_ancestor_uuids), entity_uuid, 'IN_COLLECTION', '->')
 
-            for direct_ancestor_uuid in direct_ancestor_uuids:
-                _create_relationship_tx(tx, direct_ancestor_uuid, entity_uuid, 'IN_COLLECTION', '->')
-
-            tx.commit()
+    try:
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            session.execute_write(_link_tx)
     except TransactionError as te:
         msg = "TransactionError from calling link_collection_to_entity(): "
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            # Log the full stack trace, prepend a line with our message
-            logger.info("Failed to commit link_collection_to_entity() transaction, rollback")
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -326,33 +399,29 @@ dataset_uuid_list : list of str
 
 
 def link_collection_to_entities(neo4j_driver, collection_uuid, entities_uuid_list):
+    # Run as a managed write transaction so the driver retries it on transient errors
+    def _link_tx(tx):
+        # First delete the old linkages to the Entities that are no longer members of this Collection
+        _delete_collection_linkages_tx(tx=tx
+                                       , uuid=collection_uuid
+                                       , keep_uuids=list(entities_uuid_list))
+
+        # Merge the relationship from each member Entity node to this Collection node in one statement,
+        # the unchanged linkages are left as they are
+        _merge_relationship_tx(tx=tx
+                               , source_node_uuid=list(entities_uuid_list)
+                               , direction='->'
+                               , target_node_uuid=collection_uuid
+                               , relationship='IN_COLLECTION')
+
     try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
-
-            # First delete all the old linkages between this Collection and its member Entities
-            _delete_collection_linkages_tx(tx=tx
-                                           , uuid=collection_uuid)
-
-            # Create relationship from each member Entity node to this Collection node
-            for entity_uuid in entities_uuid_list:
-                _create_relationship_tx(tx=tx
-                                        , source_node_uuid=entity_uuid
-                                        , direction='->'
-                                        , target_node_uuid=collection_uuid
-                                        , relationship='IN_COLLECTION')
-
-            tx.commit()
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            session.execute_write(_link_tx)
     except TransactionError as te:
         msg = "TransactionError from calling link_collection_to_entities(): "
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            # Log the full stack trace, prepend a line with our message
-            logger.info("Failed to commit link_collection_to_entities() transaction, rollback")
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -374,38 +443,31 @@ direct_ancestor_uuids : list
 
 
 def link_entity_to_agent(neo4j_driver, entity_uuid, direct_ancestor_uuids, activity_data_dict):
-    try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
+    # Run as a managed write transaction so the driver retries it on transient errors
+    def _link_tx(tx):
+        # First delete all the old agent linkages and Activity node between this entity and its direct ancestors
+        _delete_entity_agent_and_activity_tx(tx, entity_uuid)
 
-            # First delete all the old linkages between this entity and its direct ancestors
-            _delete_entity_agent_linkages_tx(tx, entity_uuid)
-            _delete_activity_node_and_linkages_tx(tx, entity_uuid)
+        # Get the activity uuid
+        activity_uuid = activity_data_dict['uuid']
 
-            # Get the activity uuid
-            activity_uuid = activity_data_dict['uuid']
+        # Create the Acvitity node
+        _create_activity_tx(tx, activity_data_dict)
 
-            # Create the Acvitity node
-            _create_activity_tx(tx, activity_data_dict)
+        # Create relationship from this Activity node to the target entity node
+        _create_relationship_tx(tx, activity_uuid, entity_uuid, 'WAS_GENERATED_BY', '<-', source_label='Activity')
 
-            # Create relationship from this Activity node to the target entity node
-            _create_relationship_tx(tx, activity_uuid, entity_uuid, 'WAS_GENERATED_BY', '<-')
+        # Create relationship from each ancestor entity node to this node in one statement
+        _create_relationship_tx(tx, list(direct_ancestor_uuids), entity_uuid, 'WAS_ATTRIBUTED_TO', '<-')
 
-            # Create relationship from each ancestor entity node to this node
-            for direct_ancestor_uuid in direct_ancestor_uuids:
-                _create_relationship_tx(tx, direct_ancestor_uuid, entity_uuid, 'WAS_ATTRIBUTED_TO', '<-')
-
-            tx.commit()
+    try:
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            session.execute_write(_link_tx)
     except TransactionError as te:
         msg = "TransactionError from calling link_entity_to_agent(): "
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            # Log the full stack trace, prepend a line with our message
-            logger.info("Failed to commit link_entity_to_agent() transaction, rollback")
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -427,37 +489,32 @@ direct_ancestor_uuids : list
 
 
 def link_entity_to_entity_via_activity(neo4j_driver, entity_uuid, direct_ancestor_uuids, activity_data_dict):
-    try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
-
-            # First delete all the old linkages and Activity node between this entity and its direct ancestors
-            _delete_activity_node_and_linkages_tx(tx, entity_uuid)
+    # Run as a managed write transaction so the driver retries it on transient errors
+    def _link_tx(tx):
+        # First delete all the old linkages and Activity node between this entity and its direct ancestors
+        _delete_activity_node_and_linkages_tx(tx, entity_uuid)
 
-            # Get the activity uuid
-            activity_uuid = activity_data_dict['uuid']
+        # Get the activity uuid
+        activity_uuid = activity_data_dict['uuid']
 
-            # Create the Acvitity node
-            _create_activity_tx(tx, activity_data_dict)
+        # Create the Acvitity node
+        _create_activity_tx(tx, activity_data_dict)
 
-            # Create relationship from this Activity node to the target entity node
-            _create_relationship_tx(tx, activity_uuid, entity_uuid, 'WAS_GENERATED_BY', '<-')
+        # Create relationship from this Activity node to the target entity node
+        _create_relationship_tx(tx, activity_uuid, entity_uuid, 'WAS_GENERATED_BY', '<-', source_label='Activity')
 
-            # Create relationship from each ancestor entity node to this Activity node
-            for direct_ancestor_uuid in direct_ancestor_uuids:
-                _create_relationship_tx(tx, direct_ancestor_uuid, activity_uuid, 'USED', '<-')
+        # Create relationship from each ancestor entity node to this Activity node in one statement
+        _create_relationship_tx(tx, list(direct_ancestor_uuids), activity_uuid, 'USED', '<-',
+                                target_label='Activity')
 
-            tx.commit()
+    try:
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            session.execute_write(_link_tx)
     except TransactionError as te:
         msg = "TransactionError from calling link_entity_to_entity_via_activity(): "
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            # Log the full stack trace, prepend a line with our message
-            logger.info("Failed to commit link_entity_to_entity_via_activity() transaction, rollback")
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -479,28 +536,23 @@ direct_ancestor_uuids : list
 
 
 def link_entity_to_entity(neo4j_driver, entity_uuid, direct_ancestor_uuids, activity_data_dict):
-    try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
+    # Run as a managed write transaction so the driver retries it on transient errors
+    def _link_tx(tx):
+        # First delete the old linkages to the entities that are no longer direct ancestors
+        _delete_entity_entity_linkages_tx(tx, entity_uuid, keep_uuids=list(direct_ancestor_uuids))
 
-            # First delete all the old linkages between this entity and its direct ancestors
-            _delete_entity_entity_linkages_tx(tx, entity_uuid)
+        # Merge the relationship from each ancestor entity node to this node in one statement,
+        # the unchanged linkages are left as they are
+        _merge_relationship_tx(tx, list(direct_ancestor_uuids), entity_uuid, 'WAS_DERIVED_FROM', '<-')
 
-            # Create relationship from each ancestor entity node to this node
-            for direct_ancestor_uuid in direct_ancestor_uuids:
-                _create_relationship_tx(tx, direct_ancestor_uuid, entity_uuid, 'WAS_DERIVED_FROM', '<-')
-
-            tx.commit()
+    try:
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            session.execute_write(_link_tx)
     except TransactionError as te:
         msg = "TransactionError from calling link_entity_to_entity(): "
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            # Log the full stack trace, prepend a line with our message
-            logger.info("Failed to commit link_entity_to_entity() transaction, rollback")
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -520,24 +572,19 @@ previous_revision_entity_uuid : str
 
 
 def link_entity_to_previous_revision(neo4j_driver, entity_uuid, previous_revision_entity_uuid):
-    try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
-
-            # Create relationship from ancestor entity node to this Activity node
-            _create_relationship_tx(tx, entity_uuid, previous_revision_entity_uuid, 'REVISION_OF', '->')
+    # Run as a managed write transaction so the driver retries it on transient errors
+    def _link_tx(tx):
+        # Create relationship from ancestor entity node to this Activity node
+        _create_relationship_tx(tx, entity_uuid, previous_revision_entity_uuid, 'REVISION_OF', '->')
 
-            tx.commit()
+    try:
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            session.execute_write(_link_tx)
     except TransactionError as te:
         msg = "TransactionError from calling link_entity_to_previous_revision(): "
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            # Log the full stack trace, prepend a line with our message
-            logger.info("Failed to commit link_entity_to_previous_revision() transaction, rollback")
-            tx.rollback()
-
         raise TransactionError(msg)
 
 """
@@ -560,18 +607,18 @@ dict
 def get_previous_revision_uuids(neo4j_driver, uuid):
     results = []
 
-    # Don't use [r:REVISION_OF] because
-    # Binding a variable length relationship pattern to a variable ('r') is deprecated
-    query = (f"MATCH p=(e:Entity)-[:REVISION_OF*]->(previous_revision:Entity) "
-             f"WHERE e.uuid = '{uuid}' "
-             "WITH length(p) as p_len, collect(distinct previous_revision.uuid) AS prev_revisions "
-             f"RETURN collect(distinct prev_revisions) AS {record_field_name}")
+    # The spanning tree reaches each previous revision once via its shortest path instead of
+    # enumerating every REVISION_OF path, the uuids are still grouped by their distance
+    query = (f"MATCH (e:Entity {{uuid: $uuid}}) "
+             f"CALL apoc.path.spanningTree(e, {{relationshipFilter: 'REVISION_OF>', minLevel: 1}}) YIELD path "
+             f"WITH length(path) AS p_len, collect(last(nodes(path)).uuid) AS prev_revisions "
+             f"ORDER BY p_len "
+             f"RETURN collect(prev_revisions) AS {record_field_name}")
 
-    logger.info("======get_previous_revision_uuids() query======")
-    logger.info(query)
+    logger.debug("======get_previous_revision_uuids() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             results = record[record_field_name]
@@ -599,18 +646,17 @@ dict
 def get_next_revision_uuids(neo4j_driver, uuid):
     result = []
 
-    # Don't use [r:REVISION_OF] because
-    # Binding a variable length relationship pattern to a variable ('r') is deprecated
-    query = (f"MATCH n=(e:Entity)<-[:REVISION_OF*]-(next_revision:Entity) "
-             f"WHERE e.uuid = '{uuid}' "
-             "WITH length(n) as n_len, collect(distinct next_revision.uuid) AS next_revisions "
-             f"RETURN collect(distinct next_revisions) AS {record_field_name}")
+    # Same shortest path spanning tree as get_previous_revision_uuids() in the other direction
+    query = (f"MATCH (e:Entity {{uuid: $uuid}}) "
+             f"CALL apoc.path.spanningTree(e, {{relationshipFilter: '<REVISION_OF', minLevel: 1}}) YIELD path "
+             f"WITH length(path) AS n_len, collect(last(nodes(path)).uuid) AS next_revisions "
+             f"ORDER BY n_len "
+             f"RETURN collect(next_revisions) AS {record_field_name}")
 
-    logger.info("======get_next_revision_uuids() query======")
-    logger.info(query)
+    logger.debug("======get_next_revision_uuids() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             result = record[record_field_name]
@@ -635,20 +681,14 @@ dict
 """
 
 
+@request_cached
 def get_previous_revision_uuid(neo4j_driver, uuid):
     result = None
 
-    # Don't use [r:REVISION_OF] because 
-    # Binding a variable length relationship pattern to a variable ('r') is deprecated
-    query = (f"MATCH (e:Entity)-[:REVISION_OF]->(previous_revision:Entity) "
-             f"WHERE e.uuid = '{uuid}' "
-             f"RETURN previous_revision.uuid AS {record_field_name}")
-
-    logger.info("======get_previous_revision_uuid() query======")
-    logger.info(query)
+    logger.debug("======get_previous_revision_uuid() query======\n%s", previous_revision_uuid_query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, previous_revision_uuid_query, uuid=uuid)
 
         if record and record[record_field_name]:
             result = record[record_field_name]
@@ -673,20 +713,14 @@ dict
 """
 
 
+@request_cached
 def get_next_revision_uuid(neo4j_driver, uuid):
     result = None
 
-    # Don't use [r:REVISION_OF] because 
-    # Binding a variable length relationship pattern to a variable ('r') is deprecated
-    query = (f"MATCH (e:Entity)<-[:REVISION_OF]-(next_revision:Entity) "
-             f"WHERE e.uuid = '{uuid}' "
-             f"RETURN next_revision.uuid AS {record_field_name}")
+    logger.debug("======get_next_revision_uuid() query======\n%s", next_revision_uuid_query)
 
-    logger.info("======get_next_revision_uuid() query======")
-    logger.info(query)
-
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, next_revision_uuid_query, uuid=uuid)
 
         if record and record[record_field_name]:
             result = record[record_field_name]
@@ -717,27 +751,25 @@ def get_entity_collections(neo4j_driver, uuid, property_key=None):
     results = []
 
     if property_key:
+        _validate_property_key(property_key)
         query = (f"MATCH (e:Entity)-[:IN_COLLECTION]->(c:Collection) "
-                 f"WHERE e.uuid = '{uuid}' "
-                 f"RETURN apoc.coll.toSet(COLLECT(c.{property_key})) AS {record_field_name}")
+                 f"WHERE e.uuid = $uuid "
+                 f"RETURN COLLECT(DISTINCT c.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)-[:IN_COLLECTION]->(c:Collection) "
-                 f"WHERE e.uuid = '{uuid}' "
-                 f"RETURN apoc.coll.toSet(COLLECT(c)) AS {record_field_name}")
+                 f"WHERE e.uuid = $uuid "
+                 # properties() hands back plain maps, no Node to dict conversion needed on our side
+                 f"WITH DISTINCT c "
+                 f"RETURN COLLECT(properties(c)) AS {record_field_name}")
 
-    logger.info("======get_entity_collections() query======")
-    logger.info(query)
+    logger.debug("======get_entity_collections() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
-            if property_key:
-                # Just return the list of property values from each entity node
-                results = record[record_field_name]
-            else:
-                # Convert the list of nodes to a list of dicts
-                results = _nodes_to_dicts(record[record_field_name])
+            # Either the list of property values or the list of collection dicts
+            results = record[record_field_name]
 
     return results
 
@@ -764,19 +796,14 @@ dict
 def get_dataset_upload(neo4j_driver, uuid, property_key=None):
     result = {}
 
-    query = (f"MATCH (e:Entity)-[:IN_UPLOAD]->(s:Upload) "
-             f"WHERE e.uuid = '{uuid}' "
-             f"RETURN s AS {record_field_name}")
-
-    logger.info("======get_dataset_upload() query======")
-    logger.info(query)
+    logger.debug("======get_dataset_upload() query======\n%s", dataset_upload_query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, dataset_upload_query, uuid=uuid)
 
         if record and record[record_field_name]:
             # Convert the node to a dict
-            result = _node_to_dict(record[record_field_name])
+            result = node_to_dict(record[record_field_name])
 
     return result
 
@@ -802,18 +829,18 @@ def get_collection_entities(neo4j_driver, uuid):
     results = []
 
     query = (f"MATCH (e:Entity)-[:IN_COLLECTION]->(c:Collection|Epicollection) "
-             f"WHERE c.uuid = '{uuid}' "
-             f"RETURN apoc.coll.toSet(COLLECT(e)) AS {record_field_name}")
+             f"WHERE c.uuid = $uuid "
+             # properties() hands back plain maps, no Node to dict conversion needed on our side
+             f"WITH DISTINCT e "
+             f"RETURN COLLECT(properties(e)) AS {record_field_name}")
 
-    logger.info("======get_collection_entities() query======")
-    logger.info(query)
+    logger.debug("======get_collection_entities() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
-            # Convert the list of nodes to a list of dicts
-            results = _nodes_to_dicts(record[record_field_name])
+            results = record[record_field_name]
 
     return results
 
@@ -841,14 +868,13 @@ def get_collection_datasets_data_access_levels(neo4j_driver, uuid):
     results = []
 
     query = (f"MATCH (d:Dataset)-[:IN_COLLECTION]->(c:Collection) "
-             f"WHERE c.uuid = '{uuid}' "
+             f"WHERE c.uuid = $uuid "
              f"RETURN COLLECT(DISTINCT d.data_access_level) AS {record_field_name}")
 
-    logger.info("======get_collection_datasets_data_access_levels() query======")
-    logger.info(query)
+    logger.debug("======get_collection_datasets_data_access_levels() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             # Just return the list of values
@@ -880,14 +906,13 @@ def get_collection_datasets_statuses(neo4j_driver, uuid):
     results = []
 
     query = (f"MATCH (d: Dataset)-[:IN_COLLECTION]->(c:Collection) "
-             f"WHERE c.uuid = '{uuid}' "
+             f"WHERE c.uuid = $uuid "
              f"RETURN COLLECT(DISTINCT d.status) AS {record_field_name}")
 
-    logger.info("======get_collection_datasets_statuses() query======")
-    logger.info(query)
+    logger.debug("======get_collection_datasets_statuses() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             # Just return the list of values
@@ -913,39 +938,26 @@ dataset_uuids_list : list
 
 
 def link_datasets_to_upload(neo4j_driver, upload_uuid, dataset_uuids_list):
-    # Join the list of uuids and wrap each string in single quote
-    joined_str = ', '.join("'{0}'".format(dataset_uuid) for dataset_uuid in dataset_uuids_list)
-    # Format a string to be used in Cypher query.
-    # E.g., ['fb6757b606ac35be7fa85062fde9c2e1', 'ku0gd44535be7fa85062fde98gt5']
-    dataset_uuids_list_str = '[' + joined_str + ']'
-
-    try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
+    logger.info("Create relationships between the target Upload and the given Datasets")
 
-            logger.info("Create relationships between the target Upload and the given Datasets")
+    query = ("MATCH (s:Upload {uuid: $upload_uuid}), (d:Dataset) "
+             "WHERE d.uuid IN $dataset_uuids "
+             # Use MERGE instead of CREATE to avoid creating the existing relationship multiple times
+             # MERGE creates the relationship only if there is no existing relationship
+             "MERGE (s)<-[r:IN_UPLOAD]-(d)")
 
-            query = (f"MATCH (s:Upload), (d:Dataset) "
-                     f"WHERE s.uuid = '{upload_uuid}' AND d.uuid IN {dataset_uuids_list_str} "
-                     # Use MERGE instead of CREATE to avoid creating the existing relationship multiple times
-                     # MERGE creates the relationship only if there is no existing relationship
-                     f"MERGE (s)<-[r:IN_UPLOAD]-(d)")
+    logger.debug("======link_datasets_to_upload() query======\n%s", query)
 
-            logger.info("======link_datasets_to_upload() query======")
-            logger.info(query)
-
-            tx.run(query)
-            tx.commit()
+    try:
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            # The managed transaction is retried on transient failures and rolled back on errors
+            session.execute_write(_execute_write_tx, query,
+                                  {'upload_uuid': upload_uuid, 'dataset_uuids': list(dataset_uuids_list)})
     except TransactionError as te:
-        msg = f"TransactionError from calling link_datasets_to_upload(): {te.value}"
+        msg = f"TransactionError from calling link_datasets_to_upload(): {te}"
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            logger.info("Failed to commit link_datasets_to_upload() transaction, rollback")
-
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -964,37 +976,24 @@ dataset_uuids_list : list
 
 
 def unlink_datasets_from_upload(neo4j_driver, upload_uuid, dataset_uuids_list):
-    # Join the list of uuids and wrap each string in single quote
-    joined_str = ', '.join("'{0}'".format(dataset_uuid) for dataset_uuid in dataset_uuids_list)
-    # Format a string to be used in Cypher query.
-    # E.g., ['fb6757b606ac35be7fa85062fde9c2e1', 'ku0gd44535be7fa85062fde98gt5']
-    dataset_uuids_list_str = '[' + joined_str + ']'
-
-    try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
-
-            logger.info("Delete relationships between the target Upload and the given Datasets")
+    logger.info("Delete relationships between the target Upload and the given Datasets")
 
-            query = (f"MATCH (s:Upload)<-[r:IN_UPLOAD]-(d:Dataset) "
-                     f"WHERE s.uuid = '{upload_uuid}' AND d.uuid IN {dataset_uuids_list_str} "
-                     f"DELETE r")
+    # Pass the uuids as parameters so the list is sent as is instead of being formatted into the query
+    query = ("MATCH (s:Upload {uuid: $upload_uuid})<-[r:IN_UPLOAD]-(d:Dataset) "
+             "WHERE d.uuid IN $dataset_uuids "
+             "DELETE r")
 
-            logger.info("======unlink_datasets_from_upload() query======")
-            logger.info(query)
+    logger.debug("======unlink_datasets_from_upload() query======\n%s", query)
 
-            tx.run(query)
-            tx.commit()
+    try:
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            session.execute_write(_execute_write_tx, query,
+                                  {'upload_uuid': upload_uuid, 'dataset_uuids': list(dataset_uuids_list)})
     except TransactionError as te:
-        msg = f"TransactionError from calling unlink_datasets_from_upload(): {te.value}"
+        msg = f"TransactionError from calling unlink_datasets_from_upload(): {te}"
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            logger.info("Failed to commit unlink_datasets_from_upload() transaction, rollback")
-
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -1017,25 +1016,25 @@ list
 """
 
 
+@request_cached
 def get_upload_datasets(neo4j_driver, uuid, property_key=None, query_filter=''):
     results = []
 
     if property_key:
+        _validate_property_key(property_key)
         query = (f"MATCH (e:Dataset)-[:IN_UPLOAD]->(s:Upload) "
-                 f"WHERE s.uuid = '{uuid}' {query_filter} "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(e.{property_key})) AS {record_field_name}")
+                 f"WHERE s.uuid = $uuid {query_filter} "
+                 # COLLECT(DISTINCT) removes the duplicates within the aggregation
+                 f"RETURN COLLECT(DISTINCT e.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Dataset)-[:IN_UPLOAD]->(s:Upload) "
-                 f"WHERE s.uuid = '{uuid}' {query_filter} "
-                 f"RETURN apoc.coll.toSet(COLLECT(e)) AS {record_field_name}")
+                 f"WHERE s.uuid = $uuid {query_filter} "
+                 f"RETURN COLLECT(DISTINCT e) AS {record_field_name}")
 
-    logger.info("======get_upload_datasets() query======")
-    logger.info(query)
+    logger.debug("======get_upload_datasets() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -1049,7 +1048,7 @@ def get_upload_datasets(neo4j_driver, uuid, property_key=None, query_filter=''):
 
 
 """
-Get count of published Dataset in the provenance hierarchy for a given Sample/Source
+Check if there is any published Dataset in the provenance hierarchy for a given Sample/Source
 
 Parameters
 ----------
@@ -1058,36 +1057,30 @@ neo4j_driver : neo4j.Driver object
 entity_type : str
     One of the normalized entity types: Sample, Source
 uuid : str
-    The uuid of target entity 
+    The uuid of target entity
 
 Returns
 -------
-int
-    The count of published Dataset in the provenance hierarchy 
-    below the target entity (Source, Sample and Collection)
+bool
+    True if any Dataset below the target entity is published
 """
 
 
-def count_attached_published_datasets(neo4j_driver, entity_type, uuid):
-    query = (f"MATCH (e:{entity_type})<-[:USED|WAS_GENERATED_BY*]-(d:Dataset) "
-             # Use the string function toLower() to avoid case-sensetivity issue
-             f"WHERE e.uuid='{uuid}' AND toLower(d.status) = 'published' "
-             # COLLECT() returns a list
-             # apoc.coll.toSet() reruns a set containing unique nodes
-             f"RETURN COUNT(d) AS {record_field_name}")
-
-    logger.info("======count_attached_published_datasets() query======")
-    logger.info(query)
+@request_cached
+def has_attached_published_datasets(neo4j_driver, entity_type, uuid):
+    # EXISTS {} stops expanding the descendants at the first published Dataset instead of counting all of them
+    # Use the string function toLower() to avoid case-sensetivity issue
+    query = (f"MATCH (e:{entity_type} {{uuid: $uuid}}) "
+             f"RETURN EXISTS {{ (e)<-[:USED|WAS_GENERATED_BY*]-(d:Dataset) WHERE toLower(d.status) = 'published' }} "
+             f"AS {record_field_name}")
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    logger.debug("======has_attached_published_datasets() query======\n%s", query)
 
-        count = record[record_field_name]
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
-        # logger.info("======count_attached_published_datasets() resulting count======")
-        # logger.info(count)
-
-        return count
+        # No record is returned when the target entity doesn't exist
+        return bool(record and record[record_field_name])
 
 
 """
@@ -1109,36 +1102,36 @@ dict
 """
 
 
+@request_cached
 def get_sample_direct_ancestor(neo4j_driver, uuid, property_key=None):
     result = {}
 
+    # Only the first parent is used, so stop at the first row instead of fetching all of them
     if property_key:
-        query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent:Entity) "
+        _validate_property_key(property_key)
+        query = (f"MATCH (e:Entity {{uuid: $uuid}})-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent:Entity) "
                  # Filter out the Lab entity if it's the ancestor
-                 f"WHERE e.uuid='{uuid}' AND parent.entity_type <> 'Lab' "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN parent.{property_key} AS {record_field_name}")
+                 f"WHERE parent.entity_type <> 'Lab' "
+                 f"RETURN parent.{property_key} AS {record_field_name} "
+                 f"LIMIT 1")
     else:
-        query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent:Entity) "
+        query = (f"MATCH (e:Entity {{uuid: $uuid}})-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent:Entity) "
                  # Filter out the Lab entity if it's the ancestor
-                 f"WHERE e.uuid='{uuid}' AND parent.entity_type <> 'Lab' "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN parent AS {record_field_name}")
+                 f"WHERE parent.entity_type <> 'Lab' "
+                 f"RETURN parent AS {record_field_name} "
+                 f"LIMIT 1")
 
-    logger.info("======get_sample_direct_ancestor() query======")
-    logger.info(query)
+    logger.debug("======get_sample_direct_ancestor() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
                 result = record[record_field_name]
             else:
                 # Convert the entity node to dict
-                result = _node_to_dict(record[record_field_name])
+                result = node_to_dict(record[record_field_name])
 
     return result
 
@@ -1159,89 +1152,107 @@ dict
     A dictionary of entity details returned from the Cypher query
 """
 
-
+# The triggers often look up the same entity several times within one request
+@request_cached
 def get_entity(neo4j_driver, uuid):
     result = {}
 
-    query = (f"MATCH (e:Entity) "
-             f"WHERE e.uuid = '{uuid}' "
-             f"RETURN e AS {record_field_name}")
-
-    logger.info("======get_entity() query======")
-    logger.info(query)
+    logger.debug("======get_entity() query======\n%s", entity_query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(_execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, entity_query, uuid=uuid)
 
         if record and record[record_field_name]:
             # Convert the neo4j node into Python dict
-            result = _node_to_dict(record[record_field_name])
+            result = node_to_dict(record[record_field_name])
 
     return result
 
 
 """
-Retrieve a boolean value for if an ancestor of this entity contains RUI location information
+Get the entity dicts of the given uuids in one query, the ones already looked up by get_entity()
+in the current request are taken from its request cache
 
 Parameters
 ----------
 neo4j_driver : neo4j.Driver object
     The neo4j database connection pool
-uuid : str
-    The uuid of target entity
+uuids : list
+    The uuids of the target entities
 
-Returns:
-    Boolean: If an ancestor contains RUI location information
+Returns
+-------
+dict
+    The entity dicts keyed by uuid, the uuids not found in neo4j are left out
 """
 
 
-def get_has_rui_information(neo4j_driver, entity_uuid):
-    results = str(False)
+def get_entities_bulk(neo4j_driver, uuids):
+    results = {}
+    missing_uuids = []
+    # None outside of GET/HEAD requests, the entities are then always looked up
+    cache = get_request_cache()
+
+    for uuid in uuids:
+        entity_dict = cache.get(request_cache_key('get_entity', uuid)) if cache is not None else None
 
-    # Check the source of the given entity and if the source is not Human then return "N/A"
-    source_query = (f"MATCH (e:Entity)-[:USED|WAS_GENERATED_BY*]->(s:Source) "
-                    f"WHERE e.uuid='{entity_uuid}' AND s.source_type<>'Human' "
-                    f"RETURN 'N/A' as {record_field_name}")
+        # An empty dict is a cached missing entity
+        if entity_dict:
+            results[uuid] = copy.deepcopy(entity_dict)
+        elif entity_dict is None and uuid not in missing_uuids:
+            missing_uuids.append(uuid)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, source_query)
+    if not missing_uuids:
+        return results
+
+    query = (f"MATCH (e:Entity) "
+             f"WHERE e.uuid IN $uuids "
+             f"RETURN COLLECT(e) AS {record_field_name}")
+
+    logger.debug("======get_entities_bulk() query======\n%s", query)
+
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuids=missing_uuids)
 
         if record and record[record_field_name]:
-            results = (record[record_field_name])
-            return str(results)
+            for entity_dict in nodes_to_dicts(record[record_field_name]):
+                results[entity_dict['uuid']] = entity_dict
 
-    # Check the ancestry of the given entity and if the origin sample is
-    # Adipose Tissue (AD), Blood (BD), Bone Marrow (BM), Breast (BS), Muscle (MU), or Other (OT), then return "N/A"
+                if cache is not None:
+                    cache[request_cache_key('get_entity', entity_dict['uuid'])] = copy.deepcopy(entity_dict)
 
-    organ_query = (f"MATCH (e:Entity)-[:USED|WAS_GENERATED_BY*]->(o:Sample) "
-                   f"WHERE e.uuid='{entity_uuid}' AND o.sample_category='Organ' AND o.organ IN ['AD', 'BD', 'BM', 'BS', 'MU', 'OT'] "
-                   f"RETURN 'N/A' as {record_field_name}")
+    return results
 
-    logger.info("======get_has_rui_information() organ_query======")
-    logger.info(organ_query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, organ_query)
+"""
+Retrieve a boolean value for if an ancestor of this entity contains RUI location information
+
+Parameters
+----------
+neo4j_driver : neo4j.Driver object
+    The neo4j database connection pool
+uuid : str
+    The uuid of target entity
+entity_type : str
+    The label of the target entity (e.g. Dataset or Sample), defaults to Entity
+
+Returns:
+    Boolean: If an ancestor contains RUI location information
+"""
 
-        if record and record[record_field_name]:
-            results = (record[record_field_name])
-            return str(results)
 
-    # If the first query fails to return then grab the ancestor Block and check if it contains rui_location
-    query = (f"MATCH (e:Entity)-[:USED|WAS_GENERATED_BY*]->(s:Sample) "
-             f"WHERE e.uuid='{entity_uuid}' AND s.rui_location IS NOT NULL AND NOT TRIM(s.rui_location) = '' "
-             f"RETURN COUNT(s) > 0 as {record_field_name}")
+def get_has_rui_information(neo4j_driver, entity_uuid, entity_type='Entity'):
+    query = _build_rui_information_query(entity_type)
 
-    logger.info("======get_has_rui_information() query======")
-    logger.info(query)
+    logger.debug("======get_has_rui_information() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=entity_uuid)
 
         if record and record[record_field_name]:
-            results = (record[record_field_name])
+            return record[record_field_name]
 
-    return str(results)
+    return str(False)
 
 
 ####################################################################################################
@@ -1249,58 +1260,66 @@ def get_has_rui_information(neo4j_driver, entity_uuid):
 ####################################################################################################
 
 """
-Build the property key-value pairs to be used in the Cypher clause for node creation/update
+Make sure the property key can be put into a query as is, property keys can't be passed as query parameters
 
 Parameters
 ----------
-entity_data_dict : dict
-    The target Entity node to be created
+property_key : str
+    The target property key for result filtering
 
-Returns
--------
-str
-    A string representation of the node properties map containing 
-    key-value pairs to be used in Cypher clause
+Raises
+------
+ValueError
+    If the property key is not a plain identifier
 """
 
 
-def _build_properties_map(entity_data_dict):
-    separator = ', '
-    node_properties_list = []
+def _validate_property_key(property_key):
+    if not property_key.isidentifier():
+        raise ValueError(f"Invalid property key: {property_key}")
 
-    for key, value in entity_data_dict.items():
-        if isinstance(value, (int, bool)):
-            # Treat integer and boolean as is
-            key_value_pair = f"{key}: {value}"
-        elif isinstance(value, str):
-            # Special case is the value is 'TIMESTAMP()' string
-            # Remove the quotes since neo4j only takes TIMESTAMP() as a function
-            if value == 'TIMESTAMP()':
-                key_value_pair = f"{key}: {value}"
-            else:
-                # Escape single quote
-                escaped_str = value.replace("'", r"\'")
-                # Quote the value
-                key_value_pair = f"{key}: '{escaped_str}'"
-        else:
-            # Convert list and dict to string
-            # Must also escape single quotes in the string to build a valid Cypher query
-            escaped_str = str(value).replace("'", r"\'")
-            # Also need to quote the string value
-            key_value_pair = f"{key}: '{escaped_str}'"
 
-        # Add to the list
-        node_properties_list.append(key_value_pair)
+"""
+Build the get_has_rui_information() query for the given entity label, the query only varies
+with the label so it is built once per process
 
-    # Example: {uuid: 'eab7fd6911029122d9bbd4d96116db9b', rui_location: 'Joe <info>', lab_tissue_sample_id: 'dadsadsd'}
-    # Note: all the keys are not quoted, otherwise Cypher syntax error
-    node_properties_map = f"{{ {separator.join(node_properties_list)} }}"
+The checks are CASE branches over EXISTS {} subqueries, evaluated in order and each one stops
+expanding the ancestors as soon as a match is found:
+- If the source of the given entity is not Human then "N/A"
+- If the origin sample is Adipose Tissue (AD), Blood (BD), Bone Marrow (BM), Breast (BS), Muscle (MU),
+  or Other (OT), then "N/A"
+- Otherwise whether an ancestor Sample (Block) contains rui_location
 
-    return node_properties_map
+Parameters
+----------
+entity_type : str
+    The label of the target entity (e.g. Dataset or Sample)
+
+Returns
+-------
+str
+    The query returning "N/A", "True" or "False", takes the uuid as $uuid
+"""
+
+
+@functools.lru_cache(maxsize=16)
+def _build_rui_information_query(entity_type):
+    return (f"MATCH (e:{entity_type} {{uuid: $uuid}}) "
+            f"RETURN CASE "
+            f"WHEN EXISTS {{ (e)-[:USED|WAS_GENERATED_BY*]->(s:Source) WHERE s.source_type<>'Human' }} "
+            f"THEN 'N/A' "
+            f"WHEN EXISTS {{ (e)-[:USED|WAS_GENERATED_BY*]->(o:Sample) "
+            f"WHERE o.sample_category='Organ' AND o.organ IN ['AD', 'BD', 'BM', 'BS', 'MU', 'OT'] }} "
+            f"THEN 'N/A' "
+            f"WHEN EXISTS {{ (e)-[:USED|WAS_GENERATED_BY*]->(s:Sample) "
+            f"WHERE s.rui_location IS NOT NULL AND NOT TRIM(s.rui_location) = '' }} "
+            f"THEN 'True' "
+            f"ELSE 'False' END AS {record_field_name}")
 
 
 """
-Execute a unit of work in a managed read transaction
+Execute a unit of work in a managed write transaction, the driver retries it on transient failures
+so it must not have any side effects other than the query itself
 
 Parameters
 ----------
@@ -1308,6 +1327,8 @@ tx : transaction_function
     a function that takes a transaction as an argument and does work with the transaction
 query : str
     The target cypher query to run
+parameters : dict
+    The query parameters, passed as a dict so the property keys can't clash with the argument names
 
 Returns
 -------
@@ -1316,8 +1337,8 @@ neo4j.Record or None
 """
 
 
-def _execute_readonly_tx(tx, query):
-    result = tx.run(query)
+def _execute_write_tx(tx, query, parameters=None):
+    result = tx.run(query, parameters)
     record = result.single()
     return record
 
@@ -1334,26 +1355,22 @@ activity_data_dict : dict
 
 Returns
 -------
-neo4j.node
-    A neo4j node instance of the newly created entity node
+neo4j.Result
+    The unconsumed result, the statements of the transaction are pipelined until it commits
 """
 
 
 def _create_activity_tx(tx, activity_data_dict):
-    node_properties_map = _build_properties_map(activity_data_dict)
+    node_properties_map, parameterized_data = build_parameterized_map(activity_data_dict)
 
     query = (f"CREATE (e:Activity) "
              f"SET e = {node_properties_map} "
              f"RETURN e AS {record_field_name}")
 
-    logger.info("======_create_activity_tx() query======")
-    logger.info(query)
+    logger.debug("======_create_activity_tx() query======\n%s", query)
 
-    result = tx.run(query)
-    record = result.single()
-    node = record[record_field_name]
-
-    return node
+    # Don't wait for the created node, none of the callers use it
+    return tx.run(query, parameterized_data)
 
 
 """
@@ -1370,36 +1387,12 @@ uuid : str
 
 def _delete_activity_node_and_linkages_tx(tx, uuid):
     query = (f"MATCH (s:Entity)-[in:WAS_GENERATED_BY]->(a:Activity)-[out:USED]->(t:Entity) "
-             f"WHERE s.uuid = '{uuid}' "
+             f"WHERE s.uuid = $uuid "
              f"DELETE in, a, out")
 
-    logger.info("======_delete_activity_node_and_linkages_tx() query======")
-    logger.info(query)
-
-    result = tx.run(query)
-
-
-"""
-Delete linkages between a publication and its associated collection
-
-Parameters
-----------
-tx : neo4j.Transaction object
-    The neo4j.Transaction object instance
-uuid : str
-    The uuid to target publication
-"""
+    logger.debug("======_delete_activity_node_and_linkages_tx() query======\n%s", query)
 
-
-def _delete_publication_associated_collection_linkages_tx(tx, uuid):
-    query = (f"MATCH (p:Publication)-[r:USES_DATA]->(c:Collection) "
-             f"WHERE p.uuid = '{uuid}' "
-             f"DELETE r")
-
-    logger.info("======_delete_publication_associated_collection_linkages_tx() query======")
-    logger.info(query)
-
-    result = tx.run(query)
+    result = tx.run(query, uuid=uuid)
 
 
 """
@@ -1411,18 +1404,19 @@ tx : neo4j.Transaction object
     The neo4j.Transaction object instance
 uuid : str
     The uuid of the Collection, related to Datasets by an IN_COLLECTION relationship
+keep_uuids : list
+    The uuids of the member entities whose linkages are kept, all linkages are deleted if empty
 """
 
 
-def _delete_collection_linkages_tx(tx, uuid):
+def _delete_collection_linkages_tx(tx, uuid, keep_uuids=None):
     query = (f"MATCH (e:Entity)-[in:IN_COLLECTION]->(c:Collection)"
-             f" WHERE c.uuid = '{uuid}' "
+             f" WHERE c.uuid = $uuid AND NOT e.uuid IN $keep_uuids "
              f" DELETE in")
 
-    logger.info("======_delete_collection_linkages_tx() query======")
-    logger.info(query)
+    logger.debug("======_delete_collection_linkages_tx() query======\n%s", query)
 
-    result = tx.run(query)
+    result = tx.run(query, uuid=uuid, keep_uuids=keep_uuids or [])
 
 
 """
@@ -1434,22 +1428,24 @@ tx : neo4j.Transaction object
     The neo4j.Transaction object instance
 uuid : str
     The uuid to target entity (child of those direct ancestors)
+keep_uuids : list
+    The uuids of the ancestor entities whose linkages are kept, all linkages are deleted if empty
 """
 
 
-def _delete_entity_entity_linkages_tx(tx, uuid):
+def _delete_entity_entity_linkages_tx(tx, uuid, keep_uuids=None):
     query = (f"MATCH (s:Entity)-[out:WAS_DERIVED_FROM]->(t:Entity) "
-             f"WHERE s.uuid = '{uuid}' "
+             f"WHERE s.uuid = $uuid AND NOT t.uuid IN $keep_uuids "
              f"DELETE out")
 
-    logger.debug("======_delete_entity_entity_linkages_tx() query======")
-    logger.debug(query)
+    logger.debug("======_delete_entity_entity_linkages_tx() query======\n%s", query)
 
-    result = tx.run(query)
+    result = tx.run(query, uuid=uuid, keep_uuids=keep_uuids or [])
 
 
 """
-Delete the linkage between an entity and agent
+Delete the linkages between an entity and agent, along with the Activity node and linkages
+between the entity and its direct ancestors, in one statement
 
 Parameters
 ----------
@@ -1460,15 +1456,18 @@ uuid : str
 """
 
 
-def _delete_entity_agent_linkages_tx(tx, uuid):
-    query = (f"MATCH (s:Entity)-[out:WAS_ATTRIBUTED_TO]->(t:Entity) "
-             f"WHERE s.uuid = '{uuid}' "
-             f"DELETE out")
+def _delete_entity_agent_and_activity_tx(tx, uuid):
+    query = ("MATCH (s:Entity {uuid: $uuid}) "
+             "OPTIONAL MATCH (s)-[attributed:WAS_ATTRIBUTED_TO]->(:Entity) "
+             "WITH s, COLLECT(attributed) AS attributed_rels "
+             "FOREACH (r IN attributed_rels | DELETE r) "
+             "WITH s "
+             "OPTIONAL MATCH (s)-[in:WAS_GENERATED_BY]->(a:Activity)-[out:USED]->(:Entity) "
+             "DELETE in, a, out")
 
-    logger.debug("======_delete_entity_agent_linkages_tx() query======")
-    logger.debug(query)
+    logger.debug("======_delete_entity_agent_and_activity_tx() query======\n%s", query)
 
-    result = tx.run(query)
+    result = tx.run(query, uuid=uuid)
 
 
 """
@@ -1487,80 +1486,85 @@ relationship : str
 direction: str
     The relationship direction from source node to target node: outgoing `->` or incoming `<-`
     Neo4j CQL CREATE command supports only directional relationships
-"""
-
-
-def _create_relationship_tx(tx, source_node_uuid, target_node_uuid, relationship, direction):
-    incoming = "-"
-    outgoing = "-"
-
-    if direction == "<-":
-        incoming = direction
-
-    if direction == "->":
-        outgoing = direction
-
-    match_case_source = f" IN {source_node_uuid}" if type(source_node_uuid) is list else f" = '{source_node_uuid}'"
-    match_case_target = f" IN {target_node_uuid}" if type(target_node_uuid) is list else f" = '{target_node_uuid}'"
-
-    query = (f"MATCH (s), (t) "
-             f"WHERE s.uuid {match_case_source} AND t.uuid {match_case_target} "
-             f"CREATE (s){incoming}[r:{relationship}]{outgoing}(t) "
-             f"RETURN type(r) AS {record_field_name}")
-
-    logger.info("======_create_relationship_tx() query======")
-    logger.info(query)
-
-    result = tx.run(query)
-
-
-"""
-Convert the neo4j node into Python dict
-
-Parameters
-----------
-entity_node : neo4j.node
-    The target neo4j node to be converted
+source_label : str
+    The label of source node, Entity or Activity, so the node is looked up by its uuid index
+target_label : str
+    The label of target node, Entity or Activity
 
 Returns
 -------
-dict
-    A dictionary of target entity containing all property key/value pairs
+neo4j.Result
+    The unconsumed result, the statements of the transaction are pipelined until it commits
 """
 
 
-def _node_to_dict(entity_node):
-    entity_dict = {}
+def _create_relationship_tx(tx, source_node_uuid, target_node_uuid, relationship, direction,
+                            source_label='Entity', target_label='Entity'):
+    # Wrap a single uuid so both the scalar and the list cases share the same query
+    source_node_uuids = source_node_uuid if isinstance(source_node_uuid, list) else [source_node_uuid]
+    target_node_uuids = target_node_uuid if isinstance(target_node_uuid, list) else [target_node_uuid]
+
+    # The relationship type and direction are passed as parameters via apoc.create.relationship()
+    # so the same query text (and cached query plan) is used for every relationship
+    query = ("UNWIND $source_uuids AS source_uuid "
+             "UNWIND $target_uuids AS target_uuid "
+             f"MATCH (s:{source_label} {{uuid: source_uuid}}), (t:{target_label} {{uuid: target_uuid}}) "
+             "CALL apoc.create.relationship(CASE $direction WHEN '<-' THEN t ELSE s END, $relationship, {}, "
+             "CASE $direction WHEN '<-' THEN s ELSE t END) YIELD rel "
+             f"RETURN type(rel) AS {record_field_name}")
 
-    for key, value in entity_node._properties.items():
-        entity_dict.setdefault(key, value)
+    logger.debug("======_create_relationship_tx() query======\n%s", query)
 
-    return entity_dict
+    return tx.run(query,
+                  source_uuids=source_node_uuids,
+                  target_uuids=target_node_uuids,
+                  relationship=relationship,
+                  direction=direction)
 
 
 """
-Convert the list of neo4j nodes into a list of Python dicts
+Merge a relationship from the source entity node to the target entity node in neo4j,
+only created if the same relationship doesn't exist yet
 
 Parameters
 ----------
-nodes : list
-    The list of neo4j node to be converted
+tx : neo4j.Transaction object
+    The neo4j.Transaction object instance
+source_node_uuid : str
+    The uuid of source entity node
+target_node_uuid : str
+    The uuid of target entity node
+relationship : str
+    The relationship type to be merged
+direction: str
+    The relationship direction from source node to target node: outgoing `->` or incoming `<-`
 
 Returns
 -------
-list
-    A list of target entity dicts containing all property key/value pairs
+neo4j.Result
+    The unconsumed result, the statements of the transaction are pipelined until it commits
 """
 
 
-def _nodes_to_dicts(nodes):
-    dicts = []
+def _merge_relationship_tx(tx, source_node_uuid, target_node_uuid, relationship, direction):
+    # Same as _create_relationship_tx() but both ends are entities and the relationship is merged
+    source_node_uuids = source_node_uuid if isinstance(source_node_uuid, list) else [source_node_uuid]
+    target_node_uuids = target_node_uuid if isinstance(target_node_uuid, list) else [target_node_uuid]
 
-    for node in nodes:
-        entity_dict = _node_to_dict(node)
-        dicts.append(entity_dict)
+    query = ("UNWIND $source_uuids AS source_uuid "
+             "UNWIND $target_uuids AS target_uuid "
+             "MATCH (s:Entity {uuid: source_uuid}), (t:Entity {uuid: target_uuid}) "
+             "CALL apoc.merge.relationship(CASE $direction WHEN '<-' THEN t ELSE s END, $relationship, {}, {}, "
+             "CASE $direction WHEN '<-' THEN s ELSE t END, {}) YIELD rel "
+             f"RETURN type(rel) AS {record_field_name}")
 
-    return dicts
+    logger.debug("======_merge_relationship_tx() query======\n%s", query)
+
+    return tx.run(query,
+                  source_uuids=source_node_uuids,
+                  target_uuids=target_node_uuids,
+                  relationship=relationship,
+                  direction=direction)
 
 
 """
@@ -1580,9 +1584,10 @@ neo4j.Record or None
 """
 
 
-def execute_readonly_tx(tx, query):
-    result = tx.run(query)
-    record = result.single()
+def execute_readonly_tx(tx, query, **kwargs):
+    result = tx.run(query, **kwargs)
+    # None if there is no record, single() also exhausts the result so the server cursor is released right away
+    record = result.single(strict=False)
     return record
 
 
@@ -1602,12 +1607,7 @@ dict
 
 
 def node_to_dict(entity_node):
-    entity_dict = {}
-
-    for key, value in entity_node._properties.items():
-        entity_dict.setdefault(key, value)
-
-    return entity_dict
+    return dict(entity_node)
 
 
 """
@@ -1626,13 +1626,7 @@ list
 
 
 def nodes_to_dicts(nodes):
-    dicts = []
-
-    for node in nodes:
-        entity_dict = node_to_dict(node)
-        dicts.append(entity_dict)
-
-    return dicts
+    return [dict(node) for node in nodes]
 
 
 """
@@ -1651,27 +1645,33 @@ associated_collection_uuid : str
 
 
 def link_publication_to_associated_collection(neo4j_driver, entity_uuid, associated_collection_uuid):
-    try:
-        with neo4j_driver.session() as session:
-            tx = session.begin_transaction()
+    # Accept either a single collection uuid or a list of them
+    if isinstance(associated_collection_uuid, list):
+        associated_collection_uuids = associated_collection_uuid
+    else:
+        associated_collection_uuids = [associated_collection_uuid]
 
-            # First delete any old linkage between this publication and any associated_collection
-            _delete_publication_associated_collection_linkages_tx(tx, entity_uuid)
+    # Delete any old linkage between this publication and any associated collection
+    # and create the new linkage in a single statement, so the publication node is only matched once
+    query = ("MATCH (p:Publication {uuid: $uuid}) "
+             "OPTIONAL MATCH (p)-[r:USES_DATA]->(:Collection) "
+             "DELETE r "
+             "WITH DISTINCT p "
+             "UNWIND $collection_uuids AS collection_uuid "
+             "MATCH (c:Collection {uuid: collection_uuid}) "
+             "MERGE (p)-[:USES_DATA]->(c)")
 
-            # Create relationship from this publication node to the associated collection node
-            _create_relationship_tx(tx, entity_uuid, associated_collection_uuid, 'USES_DATA', '->')
+    logger.debug("======link_publication_to_associated_collection() query======\n%s", query)
 
-            tx.commit()
+    try:
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            session.execute_write(_execute_write_tx, query,
+                                  {'uuid': entity_uuid, 'collection_uuids': associated_collection_uuids})
     except TransactionError as te:
-        msg = "TransactionError from calling link_publication_to_associated_collection(): "
+        msg = f"TransactionError from calling link_publication_to_associated_collection(): {te}"
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            # Log the full stack trace, prepend a line with our message
-            logger.info("Failed to commit link_publication_to_associated_collection() transaction, rollback")
-            tx.rollback()
-
         raise TransactionError(msg)
 
 
@@ -1694,23 +1694,25 @@ list
 """
 
 
+@request_cached
 def get_collection_associated_datasets(neo4j_driver, uuid, property_key=None):
     results = []
 
+    # COLLECT(DISTINCT) removes the duplicates within the aggregation, no extra pass with apoc.coll.toSet()
     if property_key:
+        _validate_property_key(property_key)
         query = (f"MATCH (e:Entity)-[:IN_COLLECTION|:USES_DATA]->(c:Collection) "
-                 f"WHERE c.uuid = '{uuid}' "
-                 f"RETURN apoc.coll.toSet(COLLECT(e.{property_key})) AS {record_field_name}")
+                 f"WHERE c.uuid = $uuid "
+                 f"RETURN COLLECT(DISTINCT e.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)-[:IN_COLLECTION|:USES_DATA]->(c:Collection) "
-                 f"WHERE c.uuid = '{uuid}' "
-                 f"RETURN apoc.coll.toSet(COLLECT(e)) AS {record_field_name}")
+                 f"WHERE c.uuid = $uuid "
+                 f"RETURN COLLECT(DISTINCT e) AS {record_field_name}")
 
-    logger.info("======get_collection_associated_datasets() query======")
-    logger.info(query)
+    logger.debug("======get_collection_associated_datasets() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -1742,18 +1744,19 @@ dict
 """
 
 
+@request_cached
 def get_publication_associated_collection(neo4j_driver, uuid):
     result = {}
 
-    query = (f"MATCH (p:Publication)-[:USES_DATA]->(c:Collection) "
-             f"WHERE p.uuid = '{uuid}' "
-             f"RETURN c as {record_field_name}")
+    # Only the first associated collection is used, so stop at the first row instead of fetching all of them
+    query = (f"MATCH (p:Publication {{uuid: $uuid}})-[:USES_DATA]->(c:Collection) "
+             f"RETURN c as {record_field_name} "
+             f"LIMIT 1")
 
-    logger.info("=====get_publication_associated_collection() query======")
-    logger.info(query)
+    logger.debug("=====get_publication_associated_collection() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             # Convert the neo4j node into Python dict
@@ -1781,29 +1784,28 @@ dict
 """
 
 
+@request_cached
 def get_children(neo4j_driver, uuid, property_key=None):
     results = []
 
     if property_key:
+        _validate_property_key(property_key)
         query = (f"MATCH (e:Entity)<-[:USED]-(:Activity)<-[:WAS_GENERATED_BY]-(child:Entity) "
                  # The target entity can't be a Lab
-                 f"WHERE e.uuid='{uuid}' AND e.entity_type <> 'Lab' "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(child.{property_key})) AS {record_field_name}")
+                 f"WHERE e.uuid=$uuid AND e.entity_type <> 'Lab' "
+                 # COLLECT(DISTINCT) removes the duplicates within the aggregation
+                 f"RETURN COLLECT(DISTINCT child.{property_key}) AS {record_field_name}")
     else:
         query = (f"MATCH (e:Entity)<-[:USED]-(:Activity)<-[:WAS_GENERATED_BY]-(child:Entity) "
                  # The target entity can't be a Lab
-                 f"WHERE e.uuid='{uuid}' AND e.entity_type <> 'Lab' "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(child)) AS {record_field_name}")
+                 f"WHERE e.uuid=$uuid AND e.entity_type <> 'Lab' "
+                 # COLLECT(DISTINCT) removes the duplicates within the aggregation
+                 f"RETURN COLLECT(DISTINCT child) AS {record_field_name}")
 
-    logger.info("======get_children() query======")
-    logger.info(query)
+    logger.debug("======get_children() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
         if record and record[record_field_name]:
             if property_key:
@@ -1817,7 +1819,12 @@ def get_children(neo4j_driver, uuid, property_key=None):
 
 
 """
-Build the property key-value pairs to be used in the Cypher clause for node creation/update
+Build the parameterized property key-value pairs to be used in the Cypher clause for node creation/update
+
+The values are sent as query parameters instead of being escaped and quoted into the query text,
+so the query text only depends on the property keys and its execution plan can be reused.
+The parameter names are the property keys prefixed with p_, so a property named e.g. uuid can't
+overwrite the other parameters of the query ($uuid, $activity_uuid)
 
 Parameters
 ----------
@@ -1827,44 +1834,37 @@ entity_data_dict : dict
 Returns
 -------
 str
-    A string representation of the node properties map containing 
-    key-value pairs to be used in Cypher clause
+    A string representation of the node properties map containing
+    key-parameter pairs to be used in Cypher clause
+dict
+    The parameter values keyed by parameter name (p_<property key>)
 """
-def build_properties_map(entity_data_dict):
-    separator = ', '
-    node_properties_list = []
+def build_parameterized_map(entity_data_dict):
+    data = {}
+    key_value_pairs = []
 
     for key, value in entity_data_dict.items():
-        if isinstance(value, (int, bool)):
-            # Treat integer and boolean as is
-            key_value_pair = f"{key}: {value}"
-        elif isinstance(value, str):
-            # Special case is the value is 'TIMESTAMP()' string
-            # Remove the quotes since neo4j only takes TIMESTAMP() as a function
-            if value == 'TIMESTAMP()':
-                key_value_pair = f"{key}: {value}"
-            else:
-                # Escape single quote
-                escaped_str = value.replace("'", r"\'")
-                # Quote the value
-                key_value_pair = f"{key}: '{escaped_str}'"
+        # Special case is the value is 'TIMESTAMP()' string, neo4j only takes TIMESTAMP() as a function
+        if value == 'TIMESTAMP()':
+            key_value_pairs.append(f"{key}: TIMESTAMP()")
+            continue
+
+        parameter_name = f"p_{key}"
+        key_value_pairs.append(f"{key}: ${parameter_name}")
+
+        if isinstance(value, (str, int, bool)):
+            # Strings, integers and booleans are sent as is
+            data[parameter_name] = value
         else:
-            # Convert list and dict to string, retain the original data without removing any control characters
-            # Will need to call schema_manager.convert_str_literal() to convert the list/dict literal back to object
-            # Note that schema_manager.convert_str_literal() removes any control characters to avoid SyntaxError
-            # Must also escape single quotes in the string to build a valid Cypher query
-            escaped_str = str(value).replace("'", r"\'")
-            # Also need to quote the string value
-            key_value_pair = f"{key}: '{escaped_str}'"
-
-        # Add to the list
-        node_properties_list.append(key_value_pair)
-
-    # Example: {uuid: 'eab7fd6911029122d9bbd4d96116db9b', rui_location: 'Joe <info>', lab_tissue_sample_id: 'dadsadsd'}
+            # Keep storing float, list and dict as string literals like before, neo4j can't store maps
+            # as property values and the existing nodes are read back via schema_manager.convert_str_literal()
+            data[parameter_name] = str(value)
+
+    # Example: {uuid: $p_uuid, rui_location: $p_rui_location, last_modified_timestamp: TIMESTAMP()}
     # Note: all the keys are not quoted, otherwise Cypher syntax error
-    node_properties_map = f"{{ {separator.join(node_properties_list)} }}"
+    parameterized_str = f"{{ {', '.join(key_value_pairs)} }}"
 
-    return node_properties_map
+    return parameterized_str, data
 
 
 """
@@ -1887,46 +1887,30 @@ dict
     A dictionary of updated entity details returned from the Cypher query
 """
 def update_entity(neo4j_driver, entity_type, entity_data_dict, uuid):
-    node_properties_map = build_properties_map(entity_data_dict)
+    node_properties_map, parameterized_data = build_parameterized_map(entity_data_dict)
 
-    query = (f"MATCH (e:{entity_type}) "
-             f"WHERE e.uuid = '{uuid}' "
+    # The property parameters are prefixed with p_, so a `uuid` key in the data keeps its own parameter
+    parameterized_data['uuid'] = uuid
+
+    query = (f"MATCH (e:{entity_type} {{uuid: $uuid}}) "
              f"SET e += {node_properties_map} "
              f"RETURN e AS {record_field_name}")
 
-    logger.info("======update_entity() query======")
-    logger.info(query)
+    logger.debug("======update_entity() query======\n%s", query)
 
     try:
-        with neo4j_driver.session() as session:
-            entity_dict = {}
-
-            tx = session.begin_transaction()
-
-            result = tx.run(query)
-            record = result.single()
-            entity_node = record[record_field_name]
-
-            tx.commit()
-
-            entity_dict = node_to_dict(entity_node)
-
-            # logger.info("======update_entity() resulting entity_dict======")
-            # logger.info(entity_dict)
-
-            return entity_dict
+        with neo4j_helper.new_session(neo4j_driver) as session:
+            # The managed transaction is retried on transient failures and rolled back on errors
+            record = session.execute_write(_execute_write_tx, query, parameterized_data)
     except TransactionError as te:
-        msg = f"TransactionError from calling create_entity(): {te.value}"
+        msg = f"TransactionError from calling update_entity(): {te}"
         # Log the full stack trace, prepend a line with our message
         logger.exception(msg)
 
-        if tx.closed() == False:
-            logger.info("Failed to commit update_entity() transaction, rollback")
-
-            tx.rollback()
-
         raise TransactionError(msg)
 
+    return node_to_dict(record[record_field_name])
+
 
 """
 Get all siblings by uuid
@@ -1945,43 +1929,27 @@ Returns
 dict
     A list of unique sibling dictionaries returned from the Cypher query
 """
+@request_cached
 def get_siblings(neo4j_driver, uuid, property_key=None):
-    results = []
-
     if property_key:
+        _validate_property_key(property_key)
         query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent:Entity) "
                  # filter out the Lab entities
-                 f"WHERE e.uuid='{uuid}' AND parent.entity_type <> 'LAB' "
+                 f"WHERE e.uuid=$uuid AND parent.entity_type <> 'LAB' "
                  f"MATCH (sibling:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent) "
                  f"WHERE sibling <> e "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() returns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(sibling.{property_key})) AS {record_field_name}")
+                 # A sibling sharing more than one parent is matched once per parent, keep the unique ones
+                 f"RETURN COLLECT(DISTINCT sibling.{property_key}) AS {record_field_name}")
     else:
-        query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent:Entity) "
-                 # filter out the Lab entities
-                 f"WHERE e.uuid='{uuid}' AND parent.entity_type <> 'LAB' "
-                 f"MATCH (sibling:Entity)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(parent) "
-                 f"WHERE sibling <> e "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() returns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(sibling)) AS {record_field_name}")
+        query = siblings_query
 
-    logger.info("======get_siblings() query======")
-    logger.info(query)
+    logger.debug("======get_siblings() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
-        if record and record[record_field_name]:
-            if property_key:
-                # Just return the list of property values from each entity node
-                results = record[record_field_name]
-            else:
-                # Convert the list of nodes to a list of dicts
-                results = nodes_to_dicts(record[record_field_name])
-
-    return results
+    # COLLECT() always returns one row, either the list of property values or the list of property dicts
+    return record[record_field_name] if record else []
 
 
 """
@@ -2001,94 +1969,81 @@ Returns
 dict
     A list of unique tuplet dictionaries returned from the Cypher query
 """
+@request_cached
 def get_tuplets(neo4j_driver, uuid, property_key=None):
-    results = []
-
     if property_key:
-        query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(a:Activity)-[:USED]->(parent:Entity) "
-                 # filter out the Lab entities
-                 f"WHERE e.uuid='{uuid}' AND parent.entity_type <> 'Lab' "
-                 f"MATCH (tuplet:Entity)-[:WAS_GENERATED_BY]->(a) "
-                 f"WHERE tuplet <> e "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() returns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(tuplet.{property_key})) AS {record_field_name}")
+        _validate_property_key(property_key)
+        # COLLECT(DISTINCT) removes the duplicates within the aggregation
+        query = f"{tuplets_match}RETURN COLLECT(DISTINCT tuplet.{property_key}) AS {record_field_name}"
     else:
-        query = (f"MATCH (e:Entity)-[:WAS_GENERATED_BY]->(a:Activity)-[:USED]->(parent:Entity) "
-                 # filter out the Lab entities
-                 f"WHERE e.uuid='{uuid}' AND parent.entity_type <> 'Lab' "
-                 f"MATCH (tuplet:Entity)-[:WAS_GENERATED_BY]->(a) "
-                 f"WHERE tuplet <> e "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() returns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(tuplet)) AS {record_field_name}")
-
-    logger.info("======get_tuplets() query======")
-    logger.info(query)
+        query = tuplets_query
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
+    # Lazy %s formatting, the query string is only built into the log record when DEBUG is enabled
+    logger.debug("======get_tuplets() query======\n%s", query)
 
-        if record and record[record_field_name]:
-            if property_key:
-                # Just return the list of property values from each entity node
-                results = record[record_field_name]
-            else:
-                # Convert the list of nodes to a list of dicts
-                results = nodes_to_dicts(record[record_field_name])
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
-    return results
+    # COLLECT() always returns one row, either the list of property values or the list of property dicts
+    return record[record_field_name] if record else []
 
 
 """
-Get all collections by for a given entity uuid
+Get the entities linked to the given entity by a relationship, e.g. its collections or uploads
 
 Parameters
 ----------
 neo4j_driver : neo4j.Driver object
     The neo4j database connection pool
 uuid : str
-    The uuid of target entity 
+    The uuid of target entity
+match : str
+    The MATCH clause binding the linked entities to n, e.g. collections_match
+query : str
+    The query returning the property dicts of the linked entities, e.g. collections_query
 property_key : str
     A target property key for result filtering
 
 Returns
 -------
 list
-    A list of unique collection dictionaries returned from the Cypher query
+    A list of unique property dicts, or of the property values if property_key is given
 """
-def get_collections(neo4j_driver, uuid, property_key = None):
-    results = []
-
+def _get_linked_entities(neo4j_driver, uuid, match, query, property_key=None):
     if property_key:
-        query = (f"MATCH (c:Collection)<-[:IN_COLLECTION]-(e:Entity) "
-                 f"WHERE e.uuid='{uuid}' "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(c.{property_key})) AS {record_field_name}")
-    else:
-        query = (f"MATCH (c:Collection)<-[:IN_COLLECTION]-(e:Entity) "
-                 f"WHERE e.uuid='{uuid}' "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(c)) AS {record_field_name}")
+        _validate_property_key(property_key)
+        # COLLECT(DISTINCT) removes the duplicates within the aggregation
+        query = f"{match}RETURN COLLECT(DISTINCT n.{property_key}) AS {record_field_name}"
 
-    logger.info("======get_collections() query======")
-    logger.info(query)
+    logger.debug("======_get_linked_entities() query======\n%s", query)
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
 
-        if record and record[record_field_name]:
-            if property_key:
-                # Just return the list of property values from each entity node
-                results = record[record_field_name]
-            else:
-                # Convert the list of nodes to a list of dicts
-                results = nodes_to_dicts(record[record_field_name])
+    # COLLECT() always returns one row, either the list of property values or the list of property dicts
+    return record[record_field_name] if record else []
 
-    return results
 
+"""
+Get all collections by for a given entity uuid
+
+Parameters
+----------
+neo4j_driver : neo4j.Driver object
+    The neo4j database connection pool
+uuid : str
+    The uuid of target entity 
+property_key : str
+    A target property key for result filtering
+
+Returns
+-------
+list
+    A list of unique collection dictionaries returned from the Cypher query
+"""
+@request_cached
+def get_collections(neo4j_driver, uuid, property_key = None):
+    return _get_linked_entities(neo4j_driver, uuid, collections_match, collections_query, property_key)
 
 
 """
@@ -2106,35 +2061,9 @@ Returns
 list
     A list of unique upload dictionaries returned from the Cypher query
 """
+@request_cached
 def get_uploads(neo4j_driver, uuid, property_key = None):
-    results = []
-    if property_key:
-        query = (f"MATCH (u:Upload)<-[:IN_UPLOAD]-(ds:Dataset) "
-                 f"WHERE ds.uuid='{uuid}' "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(u.{property_key})) AS {record_field_name}")
-    else:
-        query = (f"MATCH (u:Upload)<-[:IN_UPLOAD]-(ds:Dataset) "
-                 f"WHERE ds.uuid='{uuid}' "
-                 # COLLECT() returns a list
-                 # apoc.coll.toSet() reruns a set containing unique nodes
-                 f"RETURN apoc.coll.toSet(COLLECT(u)) AS {record_field_name}")
-
-    logger.info("======get_uploads() query======")
-    logger.info(query)
-
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
-        if record and record[record_field_name]:
-            if property_key:
-                # Just return the list of property values from each entity node
-                results = record[record_field_name]
-            else:
-                # Convert the list of nodes to a list of dicts
-                results = nodes_to_dicts(record[record_field_name])
-
-    return results
+    return _get_linked_entities(neo4j_driver, uuid, uploads_match, uploads_query, property_key)
 
 """
 Get the associated sources for a given entity (dataset/publication)
@@ -2154,32 +2083,237 @@ list
     A list of sources associated with an entity
 """
 
-
+@request_cached
 def get_sources_associated_entity(neo4j_driver, uuid, filter_out = None):
-    results = []
+    logger.debug("======get_sources_associated_entity() query======\n%s", sources_associated_entity_query)
 
-    query_filter = ''
-    if filter_out is not None:
-        query_filter = f" and not s.uuid in {filter_out}"
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, sources_associated_entity_query,
+                                      uuid=uuid, filter_out=list(filter_out or []))
 
-    query = (f"MATCH (e:Entity)-[*]->(s:Source) "
-             f"WHERE e.uuid = '{uuid}' {query_filter} "
-             f"RETURN apoc.coll.toSet(COLLECT(s))  as {record_field_name}")
+    # COLLECT() always returns one row with the list of property dicts
+    results = record[record_field_name] if record else []
+    _convert_sources_metadata(results)
 
-    logger.info("=====get_sources_associated_dataset() query======")
-    logger.info(query)
+    return results
 
-    with neo4j_driver.session() as session:
-        record = session.read_transaction(execute_readonly_tx, query)
 
-        if record and record[record_field_name]:
-            # Convert the neo4j node into Python dict
-            results = nodes_to_dicts(record[record_field_name])
+"""
+Get the associated sources for each of the given entities in one query instead of one query per entity
 
-        for result in results:
-            if 'metadata' in result and result['metadata'] != '{}':
-                result['metadata'] = ast.literal_eval(result['metadata'])
-            else:
-                result.pop('metadata', None)
+Parameters
+----------
+neo4j_driver : neo4j.Driver object
+    The neo4j database connection pool
+uuids : list
+    The uuids of the entities
+
+Returns
+-------
+dict
+    The lists of associated sources keyed by entity uuid, the entities without any source are left out
+"""
+
+
+def get_sources_associated_entities(neo4j_driver, uuids):
+    results = {}
+
+    query = (f"UNWIND $uuids AS uuid "
+             f"MATCH (e:Entity {{uuid: uuid}}) "
+             f"CALL apoc.path.subgraphNodes(e, {source_expansion_config}) YIELD node AS s "
+             # A uuid listed twice would expand twice, keep each source once per uuid
+             f"WITH DISTINCT uuid, s "
+             f"RETURN uuid, COLLECT(properties(s)) AS {record_field_name}")
+
+    logger.debug("======get_sources_associated_entities() query======\n%s", query)
+
+    # Entities sharing a source get the same node back, only parse its metadata once
+    parsed_metadata = {}
+
+    # The rows are fetched in a managed read transaction, the metadata is only converted once it has committed
+    def _sources_tx(tx):
+        return tx.run(query, uuids=list(uuids)).data()
+
+    with neo4j_helper.session(neo4j_driver) as session:
+        records = session.execute_read(_sources_tx)
+
+    for record in records:
+        # Already a list of property dicts
+        sources = record[record_field_name]
+        _convert_sources_metadata(sources, parsed_metadata)
+        results[record['uuid']] = sources
 
     return results
+
+
+"""
+Evaluate a stored metadata Python literal string, the results are kept per process since the same
+source metadata is read over and over and rarely changes, a changed value is simply a new cache key
+
+The metadata is stored as a Python literal rather than JSON, so it can't be parsed in Cypher via apoc.convert
+
+Parameters
+----------
+metadata_str : str
+    The string representation of the metadata dict
+
+Returns
+-------
+dict
+    The evaluated metadata, shared by all callers and must not be modified
+"""
+
+
+@functools.lru_cache(maxsize=256)
+def _literal_eval_metadata(metadata_str):
+    return ast.literal_eval(metadata_str)
+
+
+"""
+Convert the metadata of the given source dicts from the stored Python literal string to a dict in place,
+the empty metadata is removed
+
+Parameters
+----------
+sources : list
+    The source dicts
+parsed_metadata : dict
+    The already converted metadata keyed by source uuid, shared across calls to skip converting the same source twice
+"""
+
+
+def _convert_sources_metadata(sources, parsed_metadata=None):
+    if parsed_metadata is None:
+        parsed_metadata = {}
+
+    for source in sources:
+        metadata = source.get('metadata')
+
+        if not metadata or metadata == '{}':
+            source.pop('metadata', None)
+            continue
+
+        uuid = source['uuid']
+        if uuid not in parsed_metadata:
+            # Copy so the callers can't modify the cached value
+            parsed_metadata[uuid] = copy.deepcopy(_literal_eval_metadata(metadata))
+
+        source['metadata'] = parsed_metadata[uuid]
+
+
+# The subquery of each bundled property, each one aggregates on its own so they don't multiply each other's rows
+entity_bundle_subqueries = {
+    'collections': ("CALL { WITH e OPTIONAL MATCH (e)-[:IN_COLLECTION]->(c:Collection) "
+                    "RETURN COLLECT(DISTINCT properties(c)) AS collections } "),
+    'upload': ("CALL { WITH e OPTIONAL MATCH (e)-[:IN_UPLOAD]->(u:Upload) "
+               "RETURN COLLECT(DISTINCT properties(u)) AS upload } "),
+    'sources': (f"CALL {{ WITH e CALL apoc.path.subgraphNodes(e, {source_expansion_config}) YIELD node AS s "
+                f"RETURN COLLECT(DISTINCT properties(s)) AS sources }} "),
+    'direct_ancestors': ("CALL { WITH e OPTIONAL MATCH (e)-[:WAS_GENERATED_BY]->(:Activity)-[:USED]->(a:Entity) "
+                         "RETURN COLLECT(DISTINCT properties(a)) AS direct_ancestors } ")
+}
+
+
+"""
+Build the get_entity_bundle() query for the given bundled properties, the subqueries are always
+added in the same order so each combination of properties is one query string for the plan cache
+
+Parameters
+----------
+property_keys : tuple
+    The bundled properties to query, any of the entity_bundle_subqueries keys
+
+Returns
+-------
+str
+    The query returning one list per property, takes the uuid as $uuid
+"""
+
+
+@functools.lru_cache(maxsize=16)
+def _build_entity_bundle_query(property_keys):
+    if not property_keys or not set(property_keys).issubset(entity_bundle_subqueries):
+        raise ValueError(f"Invalid bundled properties: {property_keys}")
+
+    property_keys = [key for key in entity_bundle_subqueries if key in property_keys]
+
+    return (f"MATCH (e:Entity {{uuid: $uuid}}) "
+            f"{''.join(entity_bundle_subqueries[key] for key in property_keys)}"
+            f"RETURN {', '.join(property_keys)}")
+
+
+"""
+Get the given properties out of the collections, upload, sources and direct ancestors of a given entity
+in one query, used by the Dataset read triggers instead of separate lookups
+
+Parameters
+----------
+neo4j_driver : neo4j.Driver object
+    The neo4j database connection pool
+uuid : str
+    The uuid of target entity
+property_keys : tuple
+    The bundled properties to query, any of 'collections', 'upload', 'sources' and 'direct_ancestors'
+
+Returns
+-------
+dict
+    The requested properties only: the 'collections' list, the 'upload' dict (empty if not in any Upload),
+    the 'sources' list and the 'direct_ancestors' list
+"""
+
+
+@request_cached
+def get_entity_bundle(neo4j_driver, uuid, property_keys):
+    query = _build_entity_bundle_query(tuple(property_keys))
+
+    logger.debug("======get_entity_bundle() query======\n%s", query)
+
+    with neo4j_helper.session(neo4j_driver) as session:
+        record = session.execute_read(execute_readonly_tx, query, uuid=uuid)
+
+    bundle = {}
+    for key in property_keys:
+        bundle[key] = record[key] if record else []
+
+    if 'upload' in bundle:
+        bundle['upload'] = bundle['upload'][0] if bundle['upload'] else {}
+
+    if 'sources' in bundle:
+        _convert_sources_metadata(bundle['sources'])
+
+    return bundle
+
+
+"""
+Run each constant read query once with a uuid that matches nothing, so the neo4j server has already
+parsed and planned them before the first requests come in. Plans are cached by the server per query string,
+so this only needs to run once at startup, not per uWSGI process
+
+Parameters
+----------
+neo4j_driver : neo4j.Driver object
+    The neo4j database connection pool
+"""
+
+
+def warm_up_query_plans(neo4j_driver):
+    # The queries taking parameters other than $uuid list them with their warm up values
+    queries = [
+        (entity_query, {}),
+        (entity_type_query, {}),
+        (entity_creation_action_query, {}),
+        (previous_revision_uuid_query, {}),
+        (next_revision_uuid_query, {}),
+        (dataset_upload_query, {}),
+        (siblings_query, {}),
+        (tuplets_query, {}),
+        (collections_query, {}),
+        (uploads_query, {}),
+        (sources_associated_entity_query, {'filter_out': []}),
+        (_build_entity_bundle_query(tuple(entity_bundle_subqueries)), {})
+    ]
+
+    with neo4j_helper.new_session(neo4j_driver) as session:
+        for query, parameters in queries:
+            session.execute_read(execute_readonly_tx, query, uuid='__warmup__', **parameters)
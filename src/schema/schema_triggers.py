@@ -15,6 +15,7 @@ import app_neo4j_queries
 from lib import github
 from lib.exceptions import create_trigger_error_msg
 from lib.ontology import Ontology
+from lib.query_cache import is_request_cacheable
 from schema import schema_manager
 from schema import schema_errors
 from schema import schema_neo4j_queries
@@ -56,8 +57,7 @@ def set_timestamp(property_key, normalized_type, user_token, existing_data_dict,
         str: The neo4j TIMESTAMP() function as string
     """
     # Use the neo4j TIMESTAMP() function during entity creation
-    # Will be proessed in app_neo4j_queries._build_properties_map()
-    # and schema_neo4j_queries._build_properties_map()
+    # Will be proessed in schema_neo4j_queries.build_parameterized_map()
     return property_key, 'TIMESTAMP()'
 
 
@@ -306,10 +306,8 @@ def set_data_access_level(property_key, normalized_type, user_token, existing_da
 
         # public if any dataset below it in the provenance hierarchy is published
         # (i.e. Dataset.status == "Published")
-        count = schema_neo4j_queries.count_attached_published_datasets(schema_manager.get_neo4j_driver_instance(),
-                                                                       normalized_type, new_data_dict['uuid'])
-
-        if count > 0:
+        if schema_neo4j_queries.has_attached_published_datasets(schema_manager.get_neo4j_driver_instance(),
+                                                                normalized_type, new_data_dict['uuid']):
             data_access_level = SchemaConstants.ACCESS_LEVEL_PUBLIC
 
     return property_key, data_access_level
@@ -832,8 +830,12 @@ def get_entity_collections(property_key, normalized_type, user_token, existing_d
 
     # No property key needs to filter the result
     # Get back the list of collection dicts
-    collections_list = schema_neo4j_queries.get_entity_collections(schema_manager.get_neo4j_driver_instance(),
-                                                                   existing_data_dict['uuid'])
+    bundle = _get_dataset_bundle('collections', normalized_type, existing_data_dict['uuid'])
+    if bundle is not None:
+        collections_list = bundle['collections']
+    else:
+        collections_list = schema_neo4j_queries.get_entity_collections(schema_manager.get_neo4j_driver_instance(),
+                                                                       existing_data_dict['uuid'])
     if collections_list:
         # Exclude datasets from each resulting collection
         # We don't want to show too much nested information
@@ -877,8 +879,12 @@ def get_dataset_upload(property_key, normalized_type, user_token, existing_data_
         raise KeyError(msg)
 
     # It could be None if the dataset doesn't in any Upload
-    upload_dict = schema_neo4j_queries.get_dataset_upload(schema_manager.get_neo4j_driver_instance(),
-                                                          existing_data_dict['uuid'])
+    bundle = _get_dataset_bundle('upload', normalized_type, existing_data_dict['uuid'])
+    if bundle is not None:
+        upload_dict = bundle['upload']
+    else:
+        upload_dict = schema_neo4j_queries.get_dataset_upload(schema_manager.get_neo4j_driver_instance(),
+                                                              existing_data_dict['uuid'])
 
     if upload_dict:
         # Exclude datasets from each resulting Upload
@@ -968,9 +974,13 @@ def get_dataset_direct_ancestors(property_key, normalized_type, user_token, exis
 
     # No property key needs to filter the result
     # Get back the list of ancestor dicts
-    driver = schema_manager.get_neo4j_driver_instance()
-    direct_ancestors_list = schema_neo4j_queries.get_dataset_direct_ancestors(driver,
-                                                                              existing_data_dict['uuid'])
+    bundle = _get_dataset_bundle('direct_ancestors', normalized_type, existing_data_dict['uuid'])
+    if bundle is not None:
+        direct_ancestors_list = bundle['direct_ancestors']
+    else:
+        driver = schema_manager.get_neo4j_driver_instance()
+        direct_ancestors_list = schema_neo4j_queries.get_dataset_direct_ancestors(driver,
+                                                                                  existing_data_dict['uuid'])
 
     # We don't want to show too much nested information
     # The direct ancestor of a Dataset could be: Dataset or Sample
@@ -1900,7 +1910,8 @@ def get_has_rui_information(property_key, normalized_type, user_token, existing_
                 return property_key, None
 
         has_rui_information = schema_neo4j_queries.get_has_rui_information(schema_manager.get_neo4j_driver_instance(),
-                                                                           existing_data_dict['uuid'])
+                                                                           existing_data_dict['uuid'],
+                                                                           normalized_type)
         return property_key, has_rui_information
 
     return property_key, None
@@ -2522,8 +2533,11 @@ def sync_component_dataset_status(property_key, normalized_type, user_token, exi
     children_uuids_list = schema_neo4j_queries.get_children(schema_manager.get_neo4j_driver_instance(), uuid, property_key='uuid')
     status_body = {"status": status}
 
+    creation_actions = schema_neo4j_queries.get_entities_creation_action_activities(schema_manager.get_neo4j_driver_instance(),
+                                                                                    children_uuids_list)
+
     for child_uuid in children_uuids_list:
-        creation_action = schema_neo4j_queries.get_entity_creation_action_activity(schema_manager.get_neo4j_driver_instance(), child_uuid)
+        creation_action = creation_actions.get(child_uuid)
         if creation_action == 'Multi-Assay Split':
             # Update the status of the child entities
             url = schema_manager.get_entity_api_url() + 'entities/' + child_uuid
@@ -3424,6 +3438,41 @@ def _delete_files(target_property_key, property_key, normalized_type, user_token
     return generated_dict
 
 
+def _get_dataset_bundle(bundle_key, normalized_type, uuid):
+    """Get the collections, upload, sources and direct ancestors of a Dataset with one query shared by its read triggers.
+
+    Only used for GET/HEAD requests where the bundle is cached for the request, otherwise each trigger
+    would run the whole combined query instead of its own smaller lookup. Only the bundled properties
+    whose triggers run are queried, a property skipped by the caller (e.g. 'direct_ancestors' when listing
+    entities) is never part of the bundle.
+
+    Parameters
+    ----------
+    bundle_key : str
+        The bundled property the calling trigger generates: collections, upload, sources or direct_ancestors
+    normalized_type : str
+        One of the types defined in the schema yaml: Activity, Collection, Source, Sample, Dataset
+    uuid : str
+        The uuid of target entity
+
+    Returns
+    -------
+    dict or None
+        The bundle from schema_neo4j_queries.get_entity_bundle(), None if not applicable
+    """
+    if not is_request_cacheable() or not schema_manager.entity_type_instanceof(normalized_type, 'Dataset'):
+        return None
+
+    triggered_properties = schema_manager.get_triggered_properties()
+    property_keys = tuple(key for key in schema_neo4j_queries.entity_bundle_subqueries if key in triggered_properties)
+
+    # A single remaining property is as cheap with its own lookup
+    if bundle_key not in property_keys or len(property_keys) < 2:
+        return None
+
+    return schema_neo4j_queries.get_entity_bundle(schema_manager.get_neo4j_driver_instance(), uuid, property_keys)
+
+
 def _get_organ_description(organ_code):
     """Get the organ description based on the given organ code.
 
@@ -3620,8 +3669,12 @@ def set_dataset_sources(property_key, normalized_type, user_token, existing_data
         str: The target property key
         list: The list of sources associated with a dataset
     """
-    sources = schema_neo4j_queries.get_sources_associated_entity(schema_manager.get_neo4j_driver_instance(),
-                                                                 existing_data_dict['uuid'])
+    bundle = _get_dataset_bundle('sources', normalized_type, existing_data_dict['uuid'])
+    if bundle is not None:
+        sources = bundle['sources']
+    else:
+        sources = schema_neo4j_queries.get_sources_associated_entity(schema_manager.get_neo4j_driver_instance(),
+                                                                     existing_data_dict['uuid'])
     return property_key, sources
 
 
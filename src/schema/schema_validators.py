@@ -85,6 +85,7 @@ def collection_entities_are_existing_entities(property_key, normalized_entity_ty
     # Verify each UUID specified exists in the uuid-api, exists in Neo4j, and (optionally) is for a Dataset before
     # proceeding with creation of Collection.
     bad_entities_uuids = []
+    entity_uuids = []
     for entity_uuid in new_data_dict['entity_uuids']:
         try:
             # The following code duplicates some functionality existing in app.py, in
@@ -96,32 +97,35 @@ def collection_entities_are_existing_entities(property_key, normalized_entity_ty
             # Get cached ids if exist otherwise retrieve from UUID-API. Expect an
             # Exception to be raised if not found.
             entity_detail = schema_manager.get_sennet_ids(id=entity_uuid)
-            entity_uuid = entity_detail['uuid']
-
-            # If the uuid exists per the uuid-api, make sure it also exists as a Neo4j entity.
-            entity_dict = schema_neo4j_queries.get_entity(schema_manager.get_neo4j_driver_instance(), entity_uuid)
-
-            # If dataset_uuid is not found in Neo4j fail the validation.
-            if not entity_dict:
-                logger.info(f"Request for {entity_uuid} inclusion in Collection, "
-                            "but not found in Neo4j.")
-                bad_entities_uuids.append(entity_uuid)
-                continue
-
-            # Collections can have other entity types besides Dataset, so skip the Dataset check
-            if normalized_entity_type == 'Collection':
-                continue
-
-            if entity_dict['entity_type'] != 'Dataset':
-                logger.info(f"Request for {entity_uuid} inclusion in Collection, "
-                            f"but entity_type={entity_dict['entity_type']}, not Dataset.")
-                bad_entities_uuids.append(entity_uuid)
+            entity_uuids.append(entity_detail['uuid'])
         except Exception:
             # If the entity_uuid is not found, fail the validation.
             logger.info(f"Request for {entity_uuid} inclusion in Collection "
                         "failed uuid-api retrieval.")
             bad_entities_uuids.append(entity_uuid)
 
+    # If the uuids exist per the uuid-api, make sure they also exist as Neo4j entities, all in one query
+    entity_dicts = schema_neo4j_queries.get_entities_bulk(schema_manager.get_neo4j_driver_instance(), entity_uuids)
+
+    for entity_uuid in entity_uuids:
+        entity_dict = entity_dicts.get(entity_uuid)
+
+        # If dataset_uuid is not found in Neo4j fail the validation.
+        if not entity_dict:
+            logger.info(f"Request for {entity_uuid} inclusion in Collection, "
+                        "but not found in Neo4j.")
+            bad_entities_uuids.append(entity_uuid)
+            continue
+
+        # Collections can have other entity types besides Dataset, so skip the Dataset check
+        if normalized_entity_type == 'Collection':
+            continue
+
+        if entity_dict['entity_type'] != 'Dataset':
+            logger.info(f"Request for {entity_uuid} inclusion in Collection, "
+                        f"but entity_type={entity_dict['entity_type']}, not Dataset.")
+            bad_entities_uuids.append(entity_uuid)
+
     # If any uuids in the request entities_uuids are not for an existing Dataset entity which
     # exists in uuid-api and Neo4j, raise an Exception so the validation fails and the
     # operation can be rejected.
@@ -173,11 +177,10 @@ def halt_DOI_if_unpublished_dataset(property_key, normalized_entity_type, reques
         # For a Create POST request, or for an Update PUT request with 'dataset_uuids' specified,
         # retrieve all the existing Datasets specified with the request.
         dataset_uuids = existing_data_dict['dataset_uuids']
-        collection_datasets = []
+        datasets = schema_neo4j_queries.get_entities_bulk(neo4j_driver_instance, dataset_uuids)
         for dataset_uuid in dataset_uuids:
             try:
-                ds = schema_neo4j_queries.get_entity(neo4j_driver_instance
-                                                     , dataset_uuid)
+                ds = datasets[dataset_uuid]
                 if ds['data_access_level'] not in distinct_dataset_levels:
                     distinct_dataset_levels.append(ds['data_access_level'])
             except Exception as nfe:
@@ -248,6 +251,7 @@ def collection_entities_are_existing_datasets(property_key, normalized_entity_ty
     # Verify each UUID specified exists in the uuid-api, exists in Neo4j, and is for a Dataset before
     # proceeding with creation of Collection.
     bad_dataset_uuids = []
+    dataset_uuids = []
     for dataset_uuid in new_data_dict['dataset_uuids']:
         try:
             ## The following code duplicates some functionality existing in app.py, in
@@ -258,27 +262,30 @@ def collection_entities_are_existing_datasets(property_key, normalized_entity_ty
 
             # Get cached ids if exist otherwise retrieve from UUID-API. Expect an
             # Exception to be raised if not found.
-            dataset_uuid_entity = schema_manager.get_sennet_ids(id=dataset_uuid)
-
-            # If the uuid exists per the uuid-api, make sure it also exists as a Neo4j entity.
-            uuid = dataset_uuid_entity['uuid']
-            schema_neo4j_queries.get_entity(schema_manager.get_neo4j_driver_instance(), dataset_uuid)
-            entity_dict = schema_neo4j_queries.get_entity(schema_manager.get_neo4j_driver_instance(), dataset_uuid)
-
-            # If dataset_uuid is not found in Neo4j or is not for a Dataset, fail the validation.
-            if not entity_dict:
-                logger.info(f"Request for {dataset_uuid} inclusion in Collection,"
-                            f" but not found in Neo4j.")
-                bad_dataset_uuids.append(dataset_uuid)
-            elif entity_dict['entity_type'] != 'Dataset':
-                logger.info(f"Request for {dataset_uuid} inclusion in Collection,"
-                            f" but entity_type={entity_dict['entity_type']}, not Dataset.")
-                bad_dataset_uuids.append(dataset_uuid)
+            schema_manager.get_sennet_ids(id=dataset_uuid)
+            dataset_uuids.append(dataset_uuid)
         except Exception as nfe:
             # If the dataset_uuid is not found, fail the validation.
             logger.error(f"Request for {dataset_uuid} inclusion in Collection"
                          f" failed uuid-api retrieval due to {str(nfe)}")
             bad_dataset_uuids.append(dataset_uuid)
+
+    # If the uuids exist per the uuid-api, make sure they also exist as Neo4j entities, all in one query
+    entity_dicts = schema_neo4j_queries.get_entities_bulk(schema_manager.get_neo4j_driver_instance(), dataset_uuids)
+
+    for dataset_uuid in dataset_uuids:
+        entity_dict = entity_dicts.get(dataset_uuid)
+
+        # If dataset_uuid is not found in Neo4j or is not for a Dataset, fail the validation.
+        if not entity_dict:
+            logger.info(f"Request for {dataset_uuid} inclusion in Collection,"
+                        f" but not found in Neo4j.")
+            bad_dataset_uuids.append(dataset_uuid)
+        elif entity_dict['entity_type'] != 'Dataset':
+            logger.info(f"Request for {dataset_uuid} inclusion in Collection,"
+                        f" but entity_type={entity_dict['entity_type']}, not Dataset.")
+            bad_dataset_uuids.append(dataset_uuid)
+
     # If any uuids in the request dataset_uuids are not for an existing Dataset entity which
     # exists in uuid-api and Neo4j, raise an Exception so the validation fails and the
     # operation can be rejected.
@@ -566,7 +573,7 @@ def validate_creation_action(property_key, normalized_entity_type, request, exis
 
     if creation_action == 'external process':
         direct_ancestor_uuids = new_data_dict.get('direct_ancestor_uuids')
-        entity_types_dict = schema_neo4j_queries.filter_ancestors_by_type(schema_manager.get_neo4j_driver_instance(), direct_ancestor_uuids, "dataset")
+        entity_types_dict = schema_neo4j_queries.filter_ancestors_by_type(schema_manager.get_neo4j_driver_instance(), direct_ancestor_uuids, "Dataset")
         if entity_types_dict:
             raise ValueError("If 'creation_action' field is given and is 'external process', all ancestor uuids must belong to datasets. "
                              f"The following entities belong to non-dataset entities: {entity_types_dict}")
@@ -768,9 +775,11 @@ def validate_source_types_match(property_key, normalized_entity_type, request, e
 
     sources = []
     uuids = []
+    # Look up the sources of all the ancestors at once, then skip the ones already seen via a previous ancestor
+    sources_by_ancestor = schema_neo4j_queries.get_sources_associated_entities(schema_manager.get_neo4j_driver_instance(),
+                                                                               new_data_dict['direct_ancestor_uuids'])
     for uuid in new_data_dict['direct_ancestor_uuids']:
-        _sources = schema_neo4j_queries.get_sources_associated_entity(schema_manager.get_neo4j_driver_instance(),
-                                                                      uuid, filter_out=uuids)
+        _sources = [source for source in sources_by_ancestor.get(uuid, []) if source['uuid'] not in uuids]
         for _source in _sources:
             uuids.append(_source['uuid'])
 
@@ -0,0 +1,14 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture()
+def neo4j_driver():
+    """A driver mock whose sessions return no record"""
+    driver = MagicMock()
+    # The same session within a request or when used as a context manager
+    session = driver.session.return_value
+    session.__enter__.return_value = session
+    session.execute_read.return_value = None
+    yield driver
@@ -0,0 +1,83 @@
+from unittest.mock import MagicMock, patch
+
+import app_neo4j_queries
+from test.utils import assert_parameters_not_glued, executed_query
+
+
+def test_get_associated_organs_from_dataset_query(neo4j_driver):
+    """Test that the associated organs query binds the dataset uuid as a separate token"""
+
+    with patch('app_neo4j_queries.Ontology.ops') as ops_mock:
+        ops_mock.return_value.specimen_categories.return_value.ORGAN = 'Organ'
+        result = app_neo4j_queries.get_associated_organs_from_dataset(neo4j_driver, 'test_uuid')
+
+    query, parameters = executed_query(neo4j_driver)
+
+    assert result == []
+    assert "(organ:Sample {sample_category:'Organ'})" in query
+    assert 'WHERE ds.uuid=$dataset_uuid RETURN COLLECT(DISTINCT organ) AS result' in query
+    assert_parameters_not_glued(query)
+    assert parameters == {'dataset_uuid': 'test_uuid'}
+
+
+def test_get_associated_sources_from_dataset_query(neo4j_driver):
+    """Test that the associated sources query binds the dataset uuid as a separate token"""
+
+    result = app_neo4j_queries.get_associated_sources_from_dataset(neo4j_driver, 'test_uuid')
+
+    query, parameters = executed_query(neo4j_driver)
+
+    assert result == []
+    assert 'WHERE ds.uuid=$dataset_uuid RETURN COLLECT(DISTINCT source) AS result' in query
+    assert_parameters_not_glued(query)
+    assert parameters == {'dataset_uuid': 'test_uuid'}
+
+
+def test_get_prov_info_query_parameters(neo4j_driver):
+    """Test that the prov info filter values are bound as parameters instead of being part of the query"""
+
+    session = neo4j_driver.session.return_value
+
+    with patch('app_neo4j_queries.Ontology.ops') as ops_mock:
+        ops_mock.return_value.specimen_categories.return_value.ORGAN = 'Organ'
+        result = app_neo4j_queries.get_prov_info(neo4j_driver, {
+            'group_uuid': 'group_uuid', 'Organ': 'lk', 'dataset_status': 'qa'
+        }, False)
+
+    query, parameters = session.run.call_args.args
+
+    assert result == []
+    assert " AND toUpper(ds.group_uuid) = $group_uuid" in query
+    assert " WHERE toUpper(organ.organ) = $organ" in query
+    assert " AND toUpper(ds.status) = $dataset_status" in query
+    assert 'GROUP_UUID' not in query and "'LK'" not in query and "'QA'" not in query
+    assert parameters == {'group_uuid': 'GROUP_UUID', 'organ': 'LK', 'dataset_status': 'QA'}
+
+
+def test_get_sample_prov_info_query_parameters(neo4j_driver):
+    """Test that the sample prov info group uuid filter is bound as a parameter"""
+
+    session = neo4j_driver.session.return_value
+
+    with patch('app_neo4j_queries.Ontology.ops') as ops_mock:
+        ops_mock.return_value.specimen_categories.return_value.ORGAN = 'Organ'
+        result = app_neo4j_queries.get_sample_prov_info(neo4j_driver, {'group_uuid': 'group_uuid'})
+
+    query, parameters = session.run.call_args.args
+
+    assert result == []
+    assert " WHERE toUpper(s.group_uuid) = $group_uuid" in query
+    assert 'GROUP_UUID' not in query
+    assert parameters == {'group_uuid': 'GROUP_UUID'}
+
+
+def test_create_relationship_query_labels():
+    """Test that both ends of a new relationship are matched by label so their uuid indexes are used"""
+
+    tx = MagicMock()
+
+    app_neo4j_queries._create_relationship_tx(tx, 'source_uuid', 'activity_uuid', 'USED', '<-', target_label='Activity')
+
+    query = tx.run.call_args.args[0]
+
+    assert query.startswith('MATCH (s:Entity {uuid: $source_uuid}), (t:Activity {uuid: $target_uuid}) ')
@@ -0,0 +1,31 @@
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from lib import neo4j_helper
+
+
+@pytest.fixture()
+def create_driver():
+    with patch('lib.neo4j_helper.create_driver') as create_driver_mock:
+        yield create_driver_mock
+
+    neo4j_helper._drivers.clear()
+    neo4j_helper._database = None
+
+
+def test_instance_keeps_first_database(create_driver, caplog):
+    """Test that the driver and its database are only set on the first call, a different database is logged"""
+
+    driver = neo4j_helper.instance('bolt://test', 'neo4j', 'password', database='sennet')
+
+    with caplog.at_level(logging.WARNING, logger='lib.neo4j_helper'):
+        assert neo4j_helper.instance('bolt://test', 'neo4j', 'password', database='sennet') is driver
+        assert not caplog.records
+
+        assert neo4j_helper.instance('bolt://test', 'neo4j', 'password', database='other') is driver
+
+    assert create_driver.call_count == 1
+    assert neo4j_helper._database == 'sennet'
+    assert 'Ignored neo4j database other' in caplog.text
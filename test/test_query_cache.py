@@ -0,0 +1,89 @@
+import pytest
+from flask import Flask
+
+from lib import query_cache
+
+
+@pytest.fixture()
+def app():
+    yield Flask(__name__)
+
+
+@pytest.fixture()
+def cached_lookup():
+    """A request cached read function recording its calls"""
+    calls = []
+
+    @query_cache.request_cached
+    def get_entity(neo4j_driver, uuid, property_keys=None):
+        calls.append(uuid)
+        return {'uuid': uuid, 'labels': ['Entity']}
+
+    get_entity.calls = calls
+    yield get_entity
+
+
+@pytest.mark.parametrize('method', ['GET', 'HEAD'])
+def test_request_cached_caches_read_requests(app, cached_lookup, method):
+    """Test that the read function only runs once per arguments within a GET/HEAD request"""
+
+    with app.test_request_context('/', method=method):
+        first = cached_lookup(None, 'test_uuid')
+        second = cached_lookup(None, 'test_uuid')
+        cached_lookup(None, 'other_uuid')
+
+    assert first == second == {'uuid': 'test_uuid', 'labels': ['Entity']}
+    assert cached_lookup.calls == ['test_uuid', 'other_uuid']
+
+
+@pytest.mark.parametrize('method', ['POST', 'PUT', 'DELETE'])
+def test_request_cached_bypasses_write_requests(app, cached_lookup, method):
+    """Test that the read function always runs within the requests that can write to neo4j"""
+
+    with app.test_request_context('/', method=method):
+        cached_lookup(None, 'test_uuid')
+        cached_lookup(None, 'test_uuid')
+
+        assert query_cache.get_request_cache() is None
+
+    assert cached_lookup.calls == ['test_uuid', 'test_uuid']
+
+
+def test_request_cached_bypasses_outside_of_request(cached_lookup):
+    """Test that the read function always runs outside of a request, e.g. in a worker thread"""
+
+    cached_lookup(None, 'test_uuid')
+    cached_lookup(None, 'test_uuid')
+
+    assert cached_lookup.calls == ['test_uuid', 'test_uuid']
+
+
+def test_request_cached_is_scoped_to_request(app, cached_lookup):
+    """Test that a cached result is not reused by the next request"""
+
+    with app.test_request_context('/', method='GET'):
+        cached_lookup(None, 'test_uuid')
+
+    with app.test_request_context('/', method='GET'):
+        cached_lookup(None, 'test_uuid')
+
+    assert cached_lookup.calls == ['test_uuid', 'test_uuid']
+
+
+def test_request_cached_returns_copies(app, cached_lookup):
+    """Test that the callers modifying a result don't modify the cached one"""
+
+    with app.test_request_context('/', method='GET'):
+        cached_lookup(None, 'test_uuid')['labels'].append('Dataset')
+
+        assert cached_lookup(None, 'test_uuid') == {'uuid': 'test_uuid', 'labels': ['Entity']}
+
+
+def test_request_cached_bypasses_unhashable_arguments(app, cached_lookup):
+    """Test that the read function runs uncached instead of failing with unhashable arguments"""
+
+    with app.test_request_context('/', method='GET'):
+        cached_lookup(None, 'test_uuid', property_keys=['uuid'])
+        cached_lookup(None, 'test_uuid', property_keys=['uuid'])
+
+    assert cached_lookup.calls == ['test_uuid', 'test_uuid']
@@ -0,0 +1,277 @@
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask
+
+from schema import schema_neo4j_queries
+from test.utils import assert_parameters_not_glued, executed_query
+
+
+# Parameter map
+
+@pytest.mark.parametrize('value, parameter_value', [
+    ('Joe\'s <info>', 'Joe\'s <info>'),
+    (3, 3),
+    (True, True),
+    (1.5, '1.5'),
+    (['a', 1], "['a', 1]"),
+    ({'organ': 'LK'}, "{'organ': 'LK'}"),
+])
+def test_build_parameterized_map(value, parameter_value):
+    """Test that the values are passed as prefixed parameters, floats, lists and dicts as string literals"""
+
+    properties_map, parameters = schema_neo4j_queries.build_parameterized_map({'description': value})
+
+    assert properties_map == '{ description: $p_description }'
+    assert parameters == {'p_description': parameter_value}
+
+
+def test_build_parameterized_map_timestamp():
+    """Test that the TIMESTAMP() sentinel is written as the Cypher function, not as a parameter"""
+
+    properties_map, parameters = schema_neo4j_queries.build_parameterized_map({
+        'uuid': 'test_uuid',
+        'last_modified_timestamp': 'TIMESTAMP()'
+    })
+
+    assert properties_map == '{ uuid: $p_uuid, last_modified_timestamp: TIMESTAMP() }'
+    assert parameters == {'p_uuid': 'test_uuid'}
+
+
+def test_update_entity_query(neo4j_driver):
+    """Test that a uuid property doesn't overwrite the uuid parameter of the target entity"""
+
+    session = neo4j_driver.session.return_value
+    session.execute_write.return_value = {'result': {'uuid': 'test_uuid', 'description': 'new'}}
+
+    result = schema_neo4j_queries.update_entity(neo4j_driver, 'Sample',
+                                                {'uuid': 'other_uuid', 'description': 'new'}, 'test_uuid')
+
+    query, parameters = executed_query(neo4j_driver, 'execute_write')
+
+    assert result == {'uuid': 'test_uuid', 'description': 'new'}
+    assert query == ('MATCH (e:Sample {uuid: $uuid}) '
+                     'SET e += { uuid: $p_uuid, description: $p_description } '
+                     'RETURN e AS result')
+    assert parameters == {'uuid': 'test_uuid', 'p_uuid': 'other_uuid', 'p_description': 'new'}
+
+
+@pytest.mark.parametrize('labels, match', [
+    ({}, 'MATCH (s:Entity {uuid: source_uuid}), (t:Entity {uuid: target_uuid}) '),
+    ({'source_label': 'Activity'}, 'MATCH (s:Activity {uuid: source_uuid}), (t:Entity {uuid: target_uuid}) '),
+    ({'target_label': 'Activity'}, 'MATCH (s:Entity {uuid: source_uuid}), (t:Activity {uuid: target_uuid}) '),
+])
+def test_create_relationship_query_labels(labels, match):
+    """Test that both ends of a new relationship are matched by label so their uuid indexes are used"""
+
+    tx = MagicMock()
+
+    schema_neo4j_queries._create_relationship_tx(tx, ['source_uuid'], 'target_uuid', 'USED', '<-', **labels)
+
+    query = tx.run.call_args.args[0]
+
+    assert match in query
+    assert tx.run.call_args.kwargs == {'source_uuids': ['source_uuid'], 'target_uuids': ['target_uuid'],
+                                       'relationship': 'USED', 'direction': '<-'}
+
+
+# Parameterized queries
+
+@pytest.mark.parametrize('get_related, property_key', [
+    (schema_neo4j_queries.get_siblings, None),
+    (schema_neo4j_queries.get_siblings, 'uuid'),
+    (schema_neo4j_queries.get_tuplets, None),
+    (schema_neo4j_queries.get_tuplets, 'uuid'),
+    (schema_neo4j_queries.get_collections, None),
+    (schema_neo4j_queries.get_collections, 'uuid'),
+    (schema_neo4j_queries.get_uploads, None),
+    (schema_neo4j_queries.get_uploads, 'uuid'),
+])
+def test_related_entities_query(neo4j_driver, get_related, property_key):
+    """Test that the related entities queries bind the uuid as a parameter"""
+
+    result = get_related(neo4j_driver, 'test_uuid', property_key)
+
+    query, parameters = executed_query(neo4j_driver)
+
+    assert result == []
+    assert 'test_uuid' not in query
+    assert '{uuid: $uuid}' in query or 'e.uuid=$uuid ' in query
+    assert query.endswith(' AS result')
+    assert_parameters_not_glued(query)
+    assert parameters == {'uuid': 'test_uuid'}
+
+
+def test_related_entities_query_invalid_property_key(neo4j_driver):
+    """Test that a property key which isn't an identifier is rejected before building the query"""
+
+    with pytest.raises(ValueError):
+        schema_neo4j_queries.get_collections(neo4j_driver, 'test_uuid', 'uuid} RETURN 1 //')
+
+
+def test_sources_associated_entity_query(neo4j_driver):
+    """Test that the excluded sources are passed as a parameter"""
+
+    result = schema_neo4j_queries.get_sources_associated_entity(neo4j_driver, 'test_uuid', ['source_uuid'])
+
+    query, parameters = executed_query(neo4j_driver)
+
+    assert result == []
+    assert 'WHERE NOT s.uuid IN $filter_out ' in query
+    assert_parameters_not_glued(query)
+    assert parameters == {'uuid': 'test_uuid', 'filter_out': ['source_uuid']}
+
+
+def test_origin_samples_query(neo4j_driver):
+    """Test that the origin samples query doesn't walk on to the sources"""
+
+    schema_neo4j_queries.get_origin_samples(neo4j_driver, 'test_uuid')
+
+    query, parameters = executed_query(neo4j_driver)
+
+    assert query.startswith("MATCH (e:Entity {uuid: $uuid})-[:WAS_GENERATED_BY|USED*]->(s:Sample")
+    assert ':Source' not in query
+    assert parameters == {'uuid': 'test_uuid'}
+
+
+def test_dataset_organ_and_source_info(neo4j_driver):
+    """Test that the first source of each organ sample is used, the source type of the last one wins"""
+
+    session = neo4j_driver.session.return_value
+    session.execute_read.return_value = {'result': [
+        {'organ_name': 'LK', 'source': {'metadata': "{'age': 1}", 'source_type': 'Human'}},
+        {'organ_name': 'RK', 'source': None},
+        {'organ_name': 'HT', 'source': {'metadata': "{'age': 2}", 'source_type': 'Mouse'}},
+    ]}
+
+    result = schema_neo4j_queries.get_dataset_organ_and_source_info(neo4j_driver, 'test_uuid')
+
+    query, parameters = executed_query(neo4j_driver)
+
+    assert result == ({'LK', 'RK', 'HT'}, {"{'age': 1}", "{'age': 2}"}, 'Mouse')
+    assert query.startswith("MATCH (e:Dataset {uuid: $uuid})")
+    assert 'HEAD(COLLECT(d {.metadata, .source_type})) AS source ' in query
+    assert parameters == {'uuid': 'test_uuid'}
+
+
+def test_entities_creation_action_activities_read_transaction(neo4j_driver):
+    """Test that the creation actions are read in a managed read transaction"""
+
+    session = neo4j_driver.session.return_value
+    session.execute_read.return_value = [{'uuid': 'test_uuid', 'result': 'Create Dataset Activity'}]
+
+    result = schema_neo4j_queries.get_entities_creation_action_activities(neo4j_driver, ['test_uuid', 'other_uuid'])
+
+    assert result == {'test_uuid': 'Create Dataset Activity', 'other_uuid': None}
+    session.run.assert_not_called()
+
+    tx = MagicMock()
+    session.execute_read.call_args.args[0](tx)
+
+    assert tx.run.call_args.kwargs == {'uuids': ['test_uuid', 'other_uuid']}
+
+
+def test_sources_associated_entities_read_transaction(neo4j_driver):
+    """Test that the sources are read in a managed read transaction and their metadata converted afterwards"""
+
+    session = neo4j_driver.session.return_value
+    session.execute_read.return_value = [
+        {'uuid': 'test_uuid', 'result': [{'uuid': 'source_uuid', 'metadata': "{'age': 1}"}]}
+    ]
+
+    result = schema_neo4j_queries.get_sources_associated_entities(neo4j_driver, ['test_uuid', 'other_uuid'])
+
+    assert result == {'test_uuid': [{'uuid': 'source_uuid', 'metadata': {'age': 1}}]}
+    session.run.assert_not_called()
+
+    tx = MagicMock()
+    session.execute_read.call_args.args[0](tx)
+
+    assert tx.run.call_args.kwargs == {'uuids': ['test_uuid', 'other_uuid']}
+
+
+def test_attached_published_datasets_query(neo4j_driver):
+    """Test that the published status is matched case-insensitively"""
+
+    result = schema_neo4j_queries.has_attached_published_datasets(neo4j_driver, 'Source', 'test_uuid')
+
+    query, parameters = executed_query(neo4j_driver)
+
+    assert result is False
+    assert "MATCH (e:Source {uuid: $uuid}) " in query
+    assert "WHERE toLower(d.status) = 'published'" in query
+    assert parameters == {'uuid': 'test_uuid'}
+
+
+def test_entity_bundle_query_only_queries_given_properties():
+    """Test that the bundle only has the subqueries of the given properties, in a fixed order"""
+
+    query = schema_neo4j_queries._build_entity_bundle_query(('sources', 'collections'))
+
+    assert query.startswith('MATCH (e:Entity {uuid: $uuid}) CALL { WITH e OPTIONAL MATCH (e)-[:IN_COLLECTION]')
+    assert query.endswith('RETURN collections, sources')
+    assert ':IN_UPLOAD' not in query
+    assert ':WAS_GENERATED_BY]->(:Activity)' not in query
+    assert_parameters_not_glued(query)
+
+
+def test_entity_bundle_query_skipped_direct_ancestors():
+    """Test that the direct ancestors are only traversed when their trigger runs"""
+
+    query = schema_neo4j_queries._build_entity_bundle_query(('collections', 'upload', 'sources'))
+
+    assert query.endswith('RETURN collections, upload, sources')
+    assert ':WAS_GENERATED_BY]->(:Activity)-[:USED]->(a:Entity)' not in query
+
+    query = schema_neo4j_queries._build_entity_bundle_query(('collections', 'upload', 'sources', 'direct_ancestors'))
+
+    assert query.endswith('RETURN collections, upload, sources, direct_ancestors')
+    assert ':WAS_GENERATED_BY]->(:Activity)-[:USED]->(a:Entity)' in query
+
+
+@pytest.mark.parametrize('property_keys', [(), ('collections', 'uuid} RETURN 1 //')])
+def test_entity_bundle_query_invalid_properties(property_keys):
+    """Test that the properties without a bundle subquery are rejected before building the query"""
+
+    with pytest.raises(ValueError):
+        schema_neo4j_queries._build_entity_bundle_query(property_keys)
+
+
+def test_get_entity_bundle(neo4j_driver):
+    """Test that the bundle only has the given properties, the upload as a dict"""
+
+    session = neo4j_driver.session.return_value
+    session.execute_read.return_value = {'collections': [{'uuid': 'collection_uuid'}],
+                                         'upload': [{'uuid': 'upload_uuid'}]}
+
+    bundle = schema_neo4j_queries.get_entity_bundle(neo4j_driver, 'test_uuid', ('collections', 'upload'))
+
+    query, parameters = executed_query(neo4j_driver)
+
+    assert bundle == {'collections': [{'uuid': 'collection_uuid'}], 'upload': {'uuid': 'upload_uuid'}}
+    assert query.endswith('RETURN collections, upload')
+    assert parameters == {'uuid': 'test_uuid'}
+
+
+# Request cache
+
+def test_get_entities_bulk_uses_get_entity_cache(neo4j_driver):
+    """Test that the entities already looked up in a GET request are not queried again"""
+
+    session = neo4j_driver.session.return_value
+    session.execute_read.side_effect = [
+        {'result': {'uuid': 'cached_uuid', 'entity_type': 'Sample'}},
+        {'result': [{'uuid': 'other_uuid', 'entity_type': 'Dataset'}]},
+    ]
+
+    with Flask(__name__).test_request_context('/', method='GET'):
+        schema_neo4j_queries.get_entity(neo4j_driver, 'cached_uuid')
+        entities = schema_neo4j_queries.get_entities_bulk(neo4j_driver, ['cached_uuid', 'other_uuid'])
+
+    query, parameters = executed_query(neo4j_driver)
+
+    assert entities == {
+        'cached_uuid': {'uuid': 'cached_uuid', 'entity_type': 'Sample'},
+        'other_uuid': {'uuid': 'other_uuid', 'entity_type': 'Dataset'},
+    }
+    assert parameters == {'uuids': ['other_uuid']}
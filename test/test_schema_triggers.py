@@ -0,0 +1,31 @@
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from schema import schema_triggers
+
+
+@pytest.mark.parametrize('triggered_properties, property_keys', [
+    (['collections', 'upload', 'sources', 'direct_ancestors'], ('collections', 'upload', 'sources', 'direct_ancestors')),
+    (['sources', 'collections', 'status'], ('collections', 'sources')),
+    (['sources', 'status'], None),
+    (['collections', 'upload'], None),
+])
+def test_get_dataset_bundle_skipped_properties(triggered_properties, property_keys):
+    """Test that the bundle only queries the properties whose triggers run, a single one uses its own lookup"""
+
+    with Flask(__name__).test_request_context('/', method='GET'), \
+            patch('schema.schema_triggers.schema_manager') as schema_manager_mock, \
+            patch('schema.schema_triggers.schema_neo4j_queries.get_entity_bundle') as get_entity_bundle_mock:
+        schema_manager_mock.entity_type_instanceof.return_value = True
+        schema_manager_mock.get_triggered_properties.return_value = triggered_properties
+
+        bundle = schema_triggers._get_dataset_bundle('sources', 'Dataset', 'test_uuid')
+
+    if property_keys is None:
+        assert bundle is None
+        get_entity_bundle_mock.assert_not_called()
+    else:
+        assert bundle == get_entity_bundle_mock.return_value
+        assert get_entity_bundle_mock.call_args.args[1:] == ('test_uuid', property_keys)
@@ -1,3 +1,4 @@
+import re
 from dataclasses import dataclass, fields
 
 from atlas_consortia_commons.object import enum_val_lower
@@ -172,3 +173,15 @@ class MockOntology(Ontology):
         if MockOntology.Ops.as_data_dict:
             return {e.name.removeprefix("_"): e.default for e in fields(DatasetTypes)}
         return DatasetTypes
+
+
+def executed_query(neo4j_driver, method='execute_read'):
+    """Get the query and the parameters passed to the last execute_read()/execute_write() call"""
+    session = neo4j_driver.session.return_value
+    args, kwargs = getattr(session, method).call_args
+    return args[1], (args[2] if len(args) > 2 else kwargs)
+
+
+def assert_parameters_not_glued(query):
+    """A parameter directly followed by the next clause keyword makes the Cypher invalid"""
+    assert re.search(r'\$[a-z_]+(MATCH|WHERE|WITH|RETURN|AND)', query) is None